@@ -1,22 +1,72 @@
 from datetime import datetime, timedelta
 import os
-import shutil
-from urllib.parse import quote
-from flask import Flask, request, jsonify, render_template_string, redirect, url_for
-from storage import init_db, save_digest, get_digest, save_article, list_saved_articles, is_article_saved, delete_article_by_url, list_digest_dates_between
-from send_email import fetch_ai_news, fetch_news, MODEL_CONFIG, LLM_ENABLED, STOCKS, plot_stock_chart, SECTION_ORDER
+from flask import Flask, request, jsonify, render_template, redirect, url_for
+from jinja2 import ChoiceLoader, DictLoader
+from storage import (
+    init_db, save_digest, get_digest_sections, get_digest_stocks_html, get_digest_version, on_digest_saved, save_article, list_saved_articles, is_article_saved, saved_urls_among, delete_article_by_url,
+    list_digest_dates_between, latest_stocks_date, search_articles, save_checkpoint, get_checkpoints, clear_checkpoints, prune_checkpoints,
+    prune_seen_stories, close_conn,
+)
+from news_fetchers import reset_article_search_memo
+from send_email import fetch_ai_news, fetch_news, MODEL_CONFIG, LLM_ENABLED, STOCKS, render_stock_charts, SECTION_ORDER
 from stock_metrics import get_comprehensive_stock_metrics, format_metrics_html, generate_stock_summary_table
-from config import PERPLEXITY_API_KEY, STATIC_DIR
+from stock_analysis import load_price_panel
+from config import PERPLEXITY_API_KEY, STATIC_DIR, PAGE_CACHE_MAX_ENTRIES, STOCK_MAX_WORKERS, CHART_WEB_PROFILE, CHART_RETENTION_DAYS, SEEN_STORIES_RETENTION_DAYS
+from parallel import run_bounded
 from clients import client as openai_client, gemini_client
 from whatsapp_notifier import send_whatsapp_digest
+from llm_core import llm_cache_stats
+from search_cache import search_cache_stats
+from page_cache import PageCache, RenderedBody, SAVE_LABEL_SLOT, strip_nul
+from chart_store import URL_PREFIX as CHART_URL_PREFIX, prune_charts, prune_legacy_charts, chart_store_stats
 
 app = Flask(__name__)
-init_db()
+
+# Rendered digest bodies; dropped when save_digest rewrites their date
+page_cache = PageCache(PAGE_CACHE_MAX_ENTRIES)
+
+
+def init_app():
+    """Migrate the database and hook the page cache into digest saves."""
+    init_db()
+    on_digest_saved(page_cache.invalidate)
+
+
+# Spawned chart workers re-import the entry script as __mp_main__; they only need
+# this module's names, not a second run of the migrations alongside the parent
+if __name__ != '__mp_main__':
+    init_app()
+
+# Pipeline checkpoints older than this are dropped at the start of each build
+CHECKPOINT_RETENTION_DAYS = 14
 
 # Configure Flask to serve static files from data directory
 app.static_folder = STATIC_DIR
 app.static_url_path = '/static'
 
+
+@app.teardown_appcontext
+def _close_db(exc):
+    # The dev server runs each request on a new thread; close that thread's
+    # SQLite connection instead of leaving it open after the thread exits
+    close_conn()
+
+
+def _build_in_background(date, resume):
+    try:
+        build_digest_for_date(date, resume=resume)
+    finally:
+        close_conn()
+
+
+@app.after_request
+def _cache_chart_files(response):
+    # Chart filenames embed a content hash, so a URL's bytes never change
+    if request.path.startswith(CHART_URL_PREFIX) and response.status_code == 200:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 BASE_HTML = """
 <!doctype html>
 <html>
@@ -56,8 +106,9 @@ BASE_HTML = """
     <a class="nav {% if nav_active == 'calendar' %}active{% endif %}" href="/calendar">Calendar</a>
     <a class="nav {% if nav_active == 'saved' %}active{% endif %}" href="/saved">Saved</a>
     <a class="nav {% if nav_active == 'stocks' %}active{% endif %}" href="/stocks">Weekly Stocks</a>
+    <a class="nav {% if nav_active == 'search' %}active{% endif %}" href="/search">Search</a>
   </header>
-  <div class="container">{{ content|safe }}</div>
+  <div class="container">{% block content %}{{ content|safe }}{% endblock %}</div>
   <script>
   // Global save/unsave toggle (works on all pages)
   function slideOutAndRemove(el){
@@ -102,6 +153,7 @@ BASE_HTML = """
 """
 
 ARTICLE_ITEM = """
+{% macro article_card(title, url, summary, section, saved_label) -%}
 <div class="card">
   <a href="{{ url }}" style="color:#4fc3f7;font-weight:bold;text-decoration:none;font-size:16px">{{ title }}</a>
   {% if summary %}<p style="color:#ccc">{{ summary }}</p>{% endif %}
@@ -110,8 +162,90 @@ ARTICLE_ITEM = """
     <button class="btn save-toggle" data-title="{{ title|e }}" data-url="{{ url|e }}" data-summary="{{ summary|e }}" data-section="{{ section|e }}">{{ saved_label }}</button>
   </div>
 </div>
+{%- endmacro %}
+"""
+
+# Stocks card plus every section, in one pass; heading is 'h2' or 'h3'
+DIGEST_HTML = """
+{% from 'article_item.html' import article_card %}
+{% if digest.stocks_html %}<div class='card'><{{ heading }} style='margin:0 0 {{ '10px' if heading == 'h2' else '8px' }} 0'>Weekly Stocks</{{ heading }}>{{ digest.stocks_html|safe }}</div>{% endif %}
+{% for name, items in sections %}
+<{{ heading }} style="color:#4fc3f7">{{ name }}</{{ heading }}>
+{% for it in items %}{{ article_card(it.get('title', 'Untitled'), it.get('url', '#'), it.get('summary', ''), name, saved_label) }}
+{% else %}<div class='card'><p style='color:#aaa;margin:0'>No news available today - check back tomorrow</p></div>
+{% endfor %}
+{% endfor %}
+"""
+
+TODAY_HTML = """
+{% extends 'base.html' %}
+{% block content %}
+<h1>Today's Digest – {{ date_str }}</h1>
+{{ body|safe }}
+{% endblock %}
+"""
+
+CALENDAR_HTML = """
+{% extends 'base.html' %}
+{% block content %}
+{{ grid_html|safe }}
+{% if body %}
+<h2>Digest – {{ date }}</h2>
+{{ body|safe }}
+{% elif date %}
+<div class=card><p style='color:var(--muted)'>No digest for {{ date }}</p></div>
+{% endif %}
+{% endblock %}
+"""
+
+SAVED_HTML = """
+{% extends 'base.html' %}
+{% block content %}{% from 'article_item.html' import article_card %}
+<h1>Saved Articles</h1>
+{% for day, rows in groups %}
+<h2 style="color:#4fc3f7">{{ day }}</h2>
+{% for r in rows %}{{ article_card(r['title'], r['url'], r.get('summary', ''), r.get('section', ''), 'Unsave') }}
+{% endfor %}
+{% endfor %}
+{% endblock %}
 """
 
+SEARCH_HTML = """
+{% extends 'base.html' %}
+{% block content %}{% from 'article_item.html' import article_card %}
+<h1>Search</h1>
+<form method="get" action="/search" class="card" style="display:flex;gap:10px;flex-wrap:wrap">
+  <input name="q" value="{{ q }}" placeholder="Search digest history" style="flex:1;min-width:220px;background:var(--bg);color:var(--text);border:1px solid var(--border);border-radius:8px;padding:8px">
+  <select name="section" style="background:var(--bg);color:var(--text);border:1px solid var(--border);border-radius:8px;padding:8px">
+    <option value="">All sections</option>
+    {% for name in section_names %}<option value="{{ name }}" {% if name == section %}selected{% endif %}>{{ name }}</option>{% endfor %}
+  </select>
+  <button class="btn" type="submit">Search</button>
+</form>
+{% if q %}
+<p class="meta">{{ results|length }} result{{ '' if results|length == 1 else 's' }}</p>
+{% for r in results %}
+<div class="meta" style="margin:0 0 4px 2px">{{ r.digest_date }}{% if r.source %} · {{ r.source }}{% endif %}</div>
+{{ article_card(r.title, r.url or '#', r.summary, r.section, 'Unsave' if r.url in saved_urls else 'Save') }}
+{% endfor %}
+{% endif %}
+{% endblock %}
+"""
+
+# Inline templates are registered by name so Jinja compiles each once and caches it
+TEMPLATES = {
+    'base.html': BASE_HTML,
+    'article_item.html': ARTICLE_ITEM,
+    'digest.html': DIGEST_HTML,
+    'today.html': TODAY_HTML,
+    'calendar.html': CALENDAR_HTML,
+    'saved.html': SAVED_HTML,
+    'search.html': SEARCH_HTML,
+}
+app.jinja_env.loader = ChoiceLoader([DictLoader(TEMPLATES), app.jinja_env.loader])
+for _name in TEMPLATES:
+    app.jinja_env.get_template(_name)
+
 
 def _ensure_static_dir():
     # Use the configured static directory from config
@@ -119,33 +253,53 @@ def _ensure_static_dir():
     return STATIC_DIR
 
 
-def _cleanup_old_charts(keep_days=7):
-    """Remove stock chart PNG files older than keep_days."""
+def _cleanup_old_charts(keep_days=CHART_RETENTION_DAYS) -> int:
+    """Remove stored stock charts dated more than keep_days ago; returns how many went."""
     try:
-        import glob
-        from datetime import datetime, timedelta
-        
-        cutoff_time = datetime.now() - timedelta(days=keep_days)
-        pattern = os.path.join(STATIC_DIR, "*_7d.png")
-        
-        for filepath in glob.glob(pattern):
-            file_mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
-            if file_mtime < cutoff_time:
-                os.remove(filepath)
-                print(f"🧹 Cleaned up old chart: {os.path.basename(filepath)}")
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+        # Flat {ticker}_7d.png files from before the chart store age out by mtime
+        removed = prune_charts(cutoff) + prune_legacy_charts(STATIC_DIR, keep_days)
+        if removed:
+            print(f"🧹 Cleaned up {removed} chart(s) older than {cutoff}")
+        return removed
     except Exception as e:
         print(f"⚠️ Chart cleanup error: {e}")
+        return 0
 
 
-def _build_weekly_stocks_html(date: datetime) -> str:
-    # Build full stock section (summary + detailed), move charts to /static, replace cid: refs
-    static_dir = _ensure_static_dir()
+def _run_stage(run_date: str, stage: str, items, compute, transient=()):
+    """
+    Return {item: output} for one pipeline stage, reusing checkpointed items.
+    compute(missing_items, checkpoint) must call checkpoint(item, output) for each
+    item as soon as it is done, so a crash mid-stage keeps the finished ones.
+    Items in transient are built from incomplete inputs: their output is used
+    but not saved, so a resumed run recomputes them.
+    """
+    outputs = get_checkpoints(run_date, stage)
+    missing = [i for i in items if i not in outputs]
+    if len(missing) < len(items):
+        print(f"⏩ {stage}: {len(items) - len(missing)}/{len(items)} restored from checkpoint", flush=True)
+    if missing:
+        def _checkpoint(item, output):
+            if item not in transient:
+                try:
+                    save_checkpoint(run_date, stage, item, output)
+                except TypeError as e:
+                    # Used as is, but left for a resumed run to recompute
+                    print(f"⚠️ {stage}: not checkpointing {item}: {e}", flush=True)
+            outputs[item] = output
+        compute(missing, _checkpoint)
+    return outputs
+
+
+def _build_weekly_stocks_html(date: datetime, run_date: str | None = None) -> str:
+    # Build full stock section (summary + detailed), charts render into /static, replace cid: refs
+    _ensure_static_dir()
+    run_date = run_date or date.strftime('%Y-%m-%d')
     
     # Clean up old charts before generating new ones
-    _cleanup_old_charts(keep_days=30)  # Keep charts for 30 days
+    _cleanup_old_charts()
     
-    stock_metrics_list = []
-    stock_imgs = []
     # Prepare LLM clients and config identical to email job
     llm_clients = {
         'openai': openai_client if LLM_ENABLED.get('openai') else None,
@@ -154,60 +308,88 @@ def _build_weekly_stocks_html(date: datetime) -> str:
     llm_cfg = dict(MODEL_CONFIG)
     llm_cfg['perplexity_api_key'] = PERPLEXITY_API_KEY
     print("\n📈 Monday Stocks: building weekly stocks HTML...", flush=True)
-    for s in STOCKS:
-        try:
-            print(f"\n📊 Fetching metrics for {s['name']} ({s['ticker']})...", flush=True)
-            m = get_comprehensive_stock_metrics(
-                s['ticker'], s['name'], llm_enabled=LLM_ENABLED, llm_config=llm_cfg, clients=llm_clients, logger=None
-            )
-        except Exception:
-            continue
-        stock_metrics_list.append(m)
-        # Print key numbers like email
-        if m and 'error' not in m:
-            try:
-                print(f"  ✓ Current Price: {m['section_a']['Current Price']}", flush=True)
-                print(f"  ✓ Week Change: {m['section_a']['% Change WoW']}", flush=True)
-                print(f"  ✓ Market Cap: {m['section_a']['Market Cap']}", flush=True)
-                print(f"  ✓ P/E Ratio: {m['section_a']['P/E Ratio']}", flush=True)
-                print(f"  ✓ Revenue: {m['section_b']['TTM Revenue']}", flush=True)
-                print(f"  ✓ EBITDA Margin: {m['section_b']['EBITDA Margin']}", flush=True)
-                if m.get('news'):
-                    print(f"  ✓ Latest News: {m['news'][0]['title'][:60]}...", flush=True)
-                if m.get('categorized_news'):
-                    print("  ✓ Categorized updates ready", flush=True)
-                if m.get('section_c'):
-                    print("  ✓ Operational updates ready", flush=True)
-                if m.get('analyst_signal'):
-                    print(f"  ✓ Analyst Signal: {m['analyst_signal']}", flush=True)
-            except Exception:
-                pass
-        # chart
-        try:
-            print(f"  📈 Generating 7-day chart...", flush=True)
-            path = plot_stock_chart(s['ticker'], s['name'])
-            # move/copy to static
-            filename = os.path.basename(path)
-            target = os.path.join(static_dir, filename)
+    stocks_by_ticker = {s['ticker']: s for s in STOCKS}
+    results_uncheckpointed = {}
+
+    def _process_stocks(missing, checkpoint):
+        # One batched price download shared by metrics and charts
+        price_panel = load_price_panel(list(missing))
+        charts = render_stock_charts([stocks_by_ticker[t] for t in missing], price_panel, CHART_WEB_PROFILE, date=run_date)
+
+        def _one(ticker):
+            s = stocks_by_ticker[ticker]
             try:
-                shutil.copyfile(path, target)
+                print(f"\n📊 Fetching metrics for {s['name']} ({s['ticker']})...", flush=True)
+                m = get_comprehensive_stock_metrics(
+                    s['ticker'], s['name'], llm_enabled=LLM_ENABLED, llm_config=llm_cfg, clients=llm_clients, logger=None,
+                    price_history=price_panel.get(ticker)
+                )
             except Exception:
-                pass
-            stock_imgs.append({'name': s['name'], 'ticker': s['ticker'], 'img_path': target})
-            print(f"  ✓ Chart saved to: {target}", flush=True)
-        except Exception:
-            pass
+                return None
+            # Print key numbers like email
+            if m and 'error' not in m:
+                try:
+                    print(f"  ✓ Current Price: {m['section_a']['Current Price']}", flush=True)
+                    print(f"  ✓ Week Change: {m['section_a']['% Change WoW']}", flush=True)
+                    print(f"  ✓ Market Cap: {m['section_a']['Market Cap']}", flush=True)
+                    print(f"  ✓ P/E Ratio: {m['section_a']['P/E Ratio']}", flush=True)
+                    print(f"  ✓ Revenue: {m['section_b']['TTM Revenue']}", flush=True)
+                    print(f"  ✓ EBITDA Margin: {m['section_b']['EBITDA Margin']}", flush=True)
+                    if m.get('news'):
+                        print(f"  ✓ Latest News: {m['news'][0]['title'][:60]}...", flush=True)
+                    if m.get('categorized_news'):
+                        print("  ✓ Categorized updates ready", flush=True)
+                    if m.get('section_c'):
+                        print("  ✓ Operational updates ready", flush=True)
+                    if m.get('analyst_signal'):
+                        print(f"  ✓ Analyst Signal: {m['analyst_signal']}", flush=True)
+                except Exception:
+                    pass
+            chart = charts.get(ticker, {})
+            return {'metrics': m, 'img_path': chart.get('path'), 'img_url': chart.get('url')}
+
+        def _record(res):
+            # Runs on the calling thread in ticker order, so checkpoints stay serial
+            out = res['value']
+            if not out:
+                return
+            m = out['metrics']
+            if m and 'error' not in m:
+                checkpoint(res['key'], out)
+            else:
+                # Failed tickers are not checkpointed so a resumed run retries them
+                results_uncheckpointed[res['key']] = out
+
+        run_bounded([(t, lambda t=t: _one(t)) for t in missing], max_workers=STOCK_MAX_WORKERS, on_result=_record)
+
+    results = _run_stage(run_date, 'stocks', list(stocks_by_ticker), _process_stocks)
+    results.update(results_uncheckpointed)
+
+    stock_metrics_list = []
+    stock_imgs = []
+    for s in STOCKS:
+        res = results.get(s['ticker'])
+        if not res:
+            continue
+        stock_metrics_list.append(res['metrics'])
+        if res.get('img_path'):
+            stock_imgs.append({'name': s['name'], 'ticker': s['ticker'], 'img_path': res['img_path']})
     if not stock_metrics_list:
         return ''
     # Build HTML using existing helpers
     summary_html = generate_stock_summary_table(stock_metrics_list)
     detailed_html = format_metrics_html(stock_metrics_list, stock_imgs)
     html = summary_html + detailed_html
-    # Replace cid: refs with /static/actual
+    # Replace cid: refs with each chart's immutable /static/charts URL
     for s in STOCKS:
-        cid = s['ticker'].replace('.', '').replace('-', '')
-        filename = f"{s['ticker']}_7d.png"
-        html = html.replace(f"cid:{cid}", f"/static/{filename}")
+        res = results.get(s['ticker']) or {}
+        url = res.get('img_url')
+        if not url and res.get('img_path'):
+            # Checkpoints written before the chart store held only the flat file path
+            url = f"/static/{os.path.basename(res['img_path'])}"
+        if url:
+            cid = s['ticker'].replace('.', '').replace('-', '')
+            html = html.replace(f"cid:{cid}", url)
     return html
 
 
@@ -216,78 +398,110 @@ def _find_latest_stocks_date() -> str | None:
     # search back up to 180 days
     start = (today - timedelta(days=180)).strftime('%Y-%m-%d')
     end = today.strftime('%Y-%m-%d')
-    dates = sorted(list(list_digest_dates_between(start, end)))
-    dates.sort(reverse=True)
-    for ds in dates:
-        d = get_digest(ds)
-        if d and d.get('stocks_html'):
-            return ds
-    return None
+    return latest_stocks_date(start, end)
 
 
-def build_digest_for_date(date: datetime):
+def build_digest_for_date(date: datetime, resume: bool = False):
     # NOTE: used by offline job/cron only; not called from HTTP routes
-    ai = fetch_ai_news()
-    direct = fetch_news()
+    # Each stage checkpoints per section/ticker; resume=True skips work already done for this date
+    run_date = date.strftime('%Y-%m-%d')
+    if resume:
+        print(f"⏩ Resuming digest build for {run_date} from checkpoints")
+    else:
+        clear_checkpoints(run_date)
+    prune_checkpoints((date - timedelta(days=CHECKPOINT_RETENTION_DAYS)).strftime('%Y-%m-%d'))
+    prune_seen_stories((date - timedelta(days=SEEN_STORIES_RETENTION_DAYS)).strftime('%Y-%m-%d'))
+    reset_article_search_memo()
+
+    # Sections where an LLM provider failed are used for this run but never
+    # checkpointed, here or in later stages, so a resumed run fetches them again
+    ai_incomplete = {}
+
+    def _fetch_ai_sections(missing, checkpoint):
+        done = set()
+
+        def _checkpoint(sec, articles):
+            done.add(sec)
+            checkpoint(sec, articles)
+
+        fetched = fetch_ai_news(sections=missing, on_section=_checkpoint)
+        ai_incomplete.update({sec: articles for sec, articles in fetched.items() if sec not in done})
+
+    ai = _run_stage(run_date, 'fetch_ai', SECTION_ORDER, _fetch_ai_sections)
+    ai.update(ai_incomplete)
+    direct = _run_stage(run_date, 'fetch_news', SECTION_ORDER,
+                        lambda missing, checkpoint: fetch_news(sections=missing, on_section=checkpoint))
+    # Refine articles to best 6 per section before saving
+    from news_fetchers import refine_articles, is_recent_article, check_articles_for_hallucinations, assign_digest_sections, annotate_seen_stories
+
     merged = {}
-    # Always include all sections from SECTION_ORDER
+    # Always include all sections from SECTION_ORDER; filter by date first
     for sec in SECTION_ORDER:
         ai_articles = ai.get(sec, [])
         direct_articles = direct.get(sec, [])
-        merged[sec] = ai_articles + direct_articles
-    
-    # Refine articles to best 6 per section before saving
-    from news_fetchers import refine_articles, is_recent_article, check_articles_for_hallucinations
-    refined_sections = {}
+        merged[sec] = [a for a in ai_articles + direct_articles if is_recent_article(a)]
+    # Reuse earlier runs' verifications and demote already-published stories
+    merged = annotate_seen_stories(merged, run_date)
+    # A story found under several sections is verified and refined in one of them only
+    merged = assign_digest_sections(merged, SECTION_ORDER)
+
+    def _verify_sections(missing, checkpoint):
+        for section in missing:
+            recent_articles = merged.get(section, [])
+            
+            # Check for hallucinations BEFORE refining
+            print(f"\n\n{'='*60}")
+            print(f"Processing section: {section}")
+            print(f"{'='*60}")
+            
+            # Only check AI-sourced articles for hallucinations
+            ai_articles = [a for a in recent_articles if a.get('client') in ['OpenAI', 'Perplexity', 'Gemini']]
+            non_ai_articles = [a for a in recent_articles if a.get('client') not in ['OpenAI', 'Perplexity', 'Gemini']]
+            
+            if ai_articles:
+                verified_ai_articles = check_articles_for_hallucinations(ai_articles, section, days_back=3, run_date=run_date)
+                verified_articles = verified_ai_articles + non_ai_articles
+            else:
+                verified_articles = recent_articles
+            checkpoint(section, verified_articles)
+
+    def _refine_sections(missing, checkpoint):
+        for section in missing:
+            verified_articles = verified.get(section, [])
+            # Then refine to best 6
+            if LLM_ENABLED.get('openai') and verified_articles:
+                refined = refine_articles(
+                    articles=verified_articles,
+                    section=section,
+                    openai_client=openai_client,
+                    model=MODEL_CONFIG["openai_model"],
+                    max_articles=6
+                )
+                checkpoint(section, refined)
+            else:
+                # If OpenAI disabled, just take first 6
+                checkpoint(section, verified_articles[:6])
+
     # Process sections in SECTION_ORDER to maintain consistency
-    for section in SECTION_ORDER:
-        articles = merged.get(section, [])
-        # Filter by date first
-        recent_articles = [a for a in articles if is_recent_article(a)]
-        
-        # Check for hallucinations BEFORE refining
-        print(f"\n\n{'='*60}")
-        print(f"Processing section: {section}")
-        print(f"{'='*60}")
-        
-        # Only check AI-sourced articles for hallucinations
-        ai_articles = [a for a in recent_articles if a.get('client') in ['OpenAI', 'Perplexity', 'Gemini']]
-        non_ai_articles = [a for a in recent_articles if a.get('client') not in ['OpenAI', 'Perplexity', 'Gemini']]
-        
-        if ai_articles:
-            verified_ai_articles = check_articles_for_hallucinations(ai_articles, section, days_back=3)
-            verified_articles = verified_ai_articles + non_ai_articles
-        else:
-            verified_articles = recent_articles
-        
-        # Then refine to best 6
-        if LLM_ENABLED.get('openai') and verified_articles:
-            refined = refine_articles(
-                articles=verified_articles,
-                section=section,
-                openai_client=openai_client,
-                model=MODEL_CONFIG["openai_model"],
-                max_articles=6
-            )
-            refined_sections[section] = refined
-        else:
-            # If OpenAI disabled, just take first 6
-            refined_sections[section] = verified_articles[:6]
+    verified = _run_stage(run_date, 'verify', SECTION_ORDER, _verify_sections, transient=set(ai_incomplete))
+    refined_sections = _run_stage(run_date, 'refine', SECTION_ORDER, _refine_sections, transient=set(ai_incomplete))
     
     # No need for additional URL fixing since we already verified and fixed URLs in hallucination checker
-    final_sections = refined_sections
+    final_sections = {section: refined_sections.get(section, []) for section in SECTION_ORDER}
     
     payload = {
-        'date': date.strftime('%Y-%m-%d'),
+        'date': run_date,
         'sections': final_sections,
     }
     # Weekly stocks on Mondays
     if date.weekday() == 0:
         try:
-            payload['stocks_html'] = _build_weekly_stocks_html(date)
+            payload['stocks_html'] = _build_weekly_stocks_html(date, run_date=run_date)
         except Exception:
             payload['stocks_html'] = ''
     save_digest(payload['date'], payload)
+    print(f"\n💾 LLM cache: {llm_cache_stats()}")
+    print(f"💾 Search cache: {search_cache_stats()}")
     
     # Send Gmail notification that digest is ready
     try:
@@ -315,38 +529,50 @@ def build_digest_for_date(date: datetime):
     return payload
 
 
+def _digest_sections(sections: dict) -> list:
+    """(section, articles) pairs a digest page renders - all sections in order, up to 6 articles each."""
+    return [(section, sections.get(section, [])[:6]) for section in SECTION_ORDER]
+
+
+def _digest_body(date_str: str, heading: str) -> str | None:
+    """
+    Rendered digest body for a date with current saved state, or None if there is no digest.
+    The body is rendered once per digest version; later views only fill in Save/Unsave labels.
+    """
+    version = get_digest_version(date_str)
+    if version is None:
+        return None
+
+    def _render():
+        # Only the rendered sections and the stocks HTML are decoded
+        stored = get_digest_sections(date_str, SECTION_ORDER)
+        if stored is None:
+            return None
+        # Stray NULs in article text would be taken for label slots
+        sections = _digest_sections(strip_nul(stored))
+        digest = {'stocks_html': strip_nul(get_digest_stocks_html(date_str))}
+        html = render_template('digest.html', digest=digest, sections=sections, heading=heading, saved_label=SAVE_LABEL_SLOT)
+        return RenderedBody(html, [it.get('url', '#') for _, items in sections for it in items])
+
+    body = page_cache.get_or_render(('digest', date_str, version, heading), _render)
+    if body is None:
+        return None
+    return body.render(saved_urls_among(body.urls))
+
+
 @app.route('/')
 def today():
     date_str = datetime.now().strftime('%Y-%m-%d')
-    digest = get_digest(date_str)
-    if not digest:
+    body = _digest_body(date_str, 'h2')
+    if body is None:
         msg = f"""
         <div class=card>
           <h2 style='color:#ffa726;margin:0 0 8px 0'>No digest available for {date_str}</h2>
           <p style='color:#ccc;margin:0'>The background job hasn’t generated today’s digest yet. It usually takes ~45 minutes. Try again later.</p>
         </div>
         """
-        return render_template_string(BASE_HTML, content=msg, nav_active='today')
-    parts = []
-    # Weekly Stocks (if present)
-    if digest.get('stocks_html'):
-        parts.append("<div class='card'><h2 style='margin:0 0 10px 0'>Weekly Stocks</h2>" + digest['stocks_html'] + "</div>")
-    # News sections - ALWAYS show all sections in order
-    items_html = ''
-    for section in SECTION_ORDER:
-        items = digest['sections'].get(section, [])
-        items_html += f"<h2 style=\"color:#4fc3f7\">{section}</h2>"
-        if not items:
-            items_html += "<div class='card'><p style='color:#aaa;margin:0'>No news available today - check back tomorrow</p></div>"
-        else:
-            for it in items[:6]:
-                saved = is_article_saved(it.get('url','#'))
-                label = 'Unsave' if saved else 'Save'
-                search_url = f"https://www.google.com/search?q={quote(it.get('title',''))}"
-                items_html += render_template_string(ARTICLE_ITEM, title=it.get('title','Untitled'), url=it.get('url','#'), summary=it.get('summary',''), section=section, saved_label=label, search_url=search_url)
-    parts.append(items_html)
-    content = f"<h1>Today's Digest – {date_str}</h1>" + ''.join(parts)
-    return render_template_string(BASE_HTML, content=content, nav_active='today')
+        return render_template('base.html', content=msg, nav_active='today')
+    return render_template('today.html', nav_active='today', date_str=date_str, body=body)
 
 
 @app.route('/calendar')
@@ -389,31 +615,8 @@ def calendar_view():
 
     # if a date is clicked, render digest below
     q = request.args.get('date')
-    bottom = ''
-    if q:
-        digest = get_digest(q)
-        if digest:
-            parts = [f"<h2>Digest – {q}</h2>"]
-            if digest.get('stocks_html'):
-                parts.append("<div class='card'><h3 style='margin:0 0 8px 0'>Weekly Stocks</h3>" + digest['stocks_html'] + "</div>")
-            items_html = ''
-            for section in SECTION_ORDER:
-                items = digest['sections'].get(section, [])
-                items_html += f"<h3 style=\"color:#4fc3f7\">{section}</h3>"
-                if not items:
-                    items_html += "<div class='card'><p style='color:#aaa;margin:0'>No news available today - check back tomorrow</p></div>"
-                else:
-                    for it in items[:6]:
-                        saved = is_article_saved(it.get('url','#'))
-                        label = 'Unsave' if saved else 'Save'
-                        search_url = f"https://www.google.com/search?q={quote(it.get('title',''))}"
-                        items_html += render_template_string(ARTICLE_ITEM, title=it.get('title','Untitled'), url=it.get('url','#'), summary=it.get('summary',''), section=section, saved_label=label, search_url=search_url)
-            parts.append(items_html)
-            bottom = ''.join(parts)
-        else:
-            bottom = f"<div class=card><p style='color:var(--muted)'>No digest for {q}</p></div>"
-
-    return render_template_string(BASE_HTML, content=head + days_html + bottom, nav_active='calendar')
+    body = _digest_body(q, 'h3') if q else None
+    return render_template('calendar.html', nav_active='calendar', grid_html=head + days_html, date=q, body=body)
 
 
 @app.route('/saved')
@@ -427,16 +630,45 @@ def saved():
             return dt.date().isoformat()
         except Exception:
             return (r.get('published_date') or r.get('saved_at'))[:10]
-    html = '<h1>Saved Articles</h1>'
-    last_date = None
+    groups = []
     for r in rows:
         d = pick_date(r)
-        if d != last_date:
-            html += f'<h2 style="color:#4fc3f7">{d}</h2>'
-            last_date = d
-        search_url = f"https://www.google.com/search?q={quote(r.get('title',''))}"
-        html += render_template_string(ARTICLE_ITEM, title=r['title'], url=r['url'], summary=r.get('summary',''), section=r.get('section',''), saved_label='Unsave', search_url=search_url)
-    return render_template_string(BASE_HTML, content=html, nav_active='saved')
+        if not groups or groups[-1][0] != d:
+            groups.append((d, []))
+        groups[-1][1].append(r)
+    return render_template('saved.html', nav_active='saved', groups=groups)
+
+
+def _search_params() -> dict:
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+    except ValueError:
+        limit = 50
+    return {
+        'query': request.args.get('q', '').strip(),
+        'section': request.args.get('section', '').strip(),
+        'start_date': request.args.get('from', '').strip(),
+        'end_date': request.args.get('to', '').strip(),
+        'limit': limit,
+    }
+
+
+@app.route('/search')
+def search():
+    params = _search_params()
+    results = search_articles(**params)
+    saved_urls = saved_urls_among([r['url'] for r in results])
+    return render_template('search.html', nav_active='search', q=params['query'], section=params['section'],
+                           section_names=SECTION_ORDER, results=results, saved_urls=saved_urls)
+
+
+@app.route('/api/search')
+def api_search():
+    """JSON full-text search over digest history: ?q=&section=&from=YYYY-MM-DD&to=YYYY-MM-DD&limit="""
+    params = _search_params()
+    if not params['query']:
+        return jsonify({'error': 'missing q'}), 400
+    return jsonify({'query': params['query'], 'results': search_articles(**params)}), 200
 
 
 @app.route('/api/save', methods=['POST'])
@@ -488,18 +720,23 @@ def stocks():
           <p style='color:#ccc;margin:0'>The background job generates the weekly stocks report every Monday. Check back after the Monday morning run.</p>
         </div>
         """
-        return render_template_string(BASE_HTML, content=msg, nav_active='stocks')
-    dig = get_digest(ds)
-    if not dig or not dig.get('stocks_html'):
+        return render_template('base.html', content=msg, nav_active='stocks')
+    version = get_digest_version(ds)
+
+    def _render():
+        return RenderedBody(strip_nul(get_digest_stocks_html(ds) or ''), [])
+
+    stocks_body = page_cache.get_or_render(('stocks', ds, version), _render).render(set()) if version else ''
+    if not stocks_body:
         msg = f"""
         <div class=card>
           <h2 style='color:#ffa726;margin:0 0 8px 0'>No stocks content for {ds}</h2>
           <p style='color:#ccc;margin:0'>The stocks data was not generated for this date. This typically happens on non-Monday dates.</p>
         </div>
         """
-        return render_template_string(BASE_HTML, content=msg, nav_active='stocks')
-    content = f"<h1>Weekly Stocks — {ds}</h1><div class='card'>" + dig['stocks_html'] + "</div>"
-    return render_template_string(BASE_HTML, content=content, nav_active='stocks')
+        return render_template('base.html', content=msg, nav_active='stocks')
+    content = f"<h1>Weekly Stocks — {ds}</h1><div class='card'>" + stocks_body + "</div>"
+    return render_template('base.html', content=content, nav_active='stocks')
 
 
 @app.route('/api/trigger/daily-digest', methods=['POST'])
@@ -515,13 +752,15 @@ def trigger_daily_digest():
     try:
         date = datetime.now()
         is_monday = date.weekday() == 0
+        # ?resume=1 continues a failed run from its checkpoints instead of starting over
+        resume = request.args.get('resume', '').lower() in ('1', 'true', 'yes')
         
         digest_type = "daily news + weekly stocks" if is_monday else "daily news"
-        print(f"🔄 Triggered {digest_type} collection for {date.strftime('%Y-%m-%d')}")
+        print(f"🔄 Triggered {digest_type} collection for {date.strftime('%Y-%m-%d')}{' (resume)' if resume else ''}")
         
         # Start digest build in background thread
         import threading
-        thread = threading.Thread(target=build_digest_for_date, args=(date,))
+        thread = threading.Thread(target=_build_in_background, args=(date, resume))
         thread.daemon = True  # Dies when main process dies
         thread.start()
         
@@ -530,6 +769,7 @@ def trigger_daily_digest():
             'date': date.strftime('%Y-%m-%d'),
             'digest_type': digest_type,
             'is_monday': is_monday,
+            'resume': resume,
             'message': 'Digest processing started in background'
         }), 200
     except Exception as e:
@@ -560,25 +800,14 @@ def cleanup_charts():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        # Get days parameter (default 30)
-        days = request.args.get('days', 30, type=int)
-        
-        # Count files before cleanup
-        pattern = os.path.join(STATIC_DIR, "*_7d.png")
-        import glob
-        before_count = len(glob.glob(pattern))
-        
-        # Run cleanup
-        _cleanup_old_charts(keep_days=days)
-        
-        # Count files after cleanup
-        after_count = len(glob.glob(pattern))
-        removed_count = before_count - after_count
-        
+        days = request.args.get('days', CHART_RETENTION_DAYS, type=int)
+        removed_count = _cleanup_old_charts(keep_days=days)
+        after = chart_store_stats()
+
         return jsonify({
             'success': True,
-            'files_before': before_count,
-            'files_after': after_count,
+            'files_before': after['charts'] + removed_count,
+            'files_after': after['charts'],
             'files_removed': removed_count,
             'keep_days': days
         }), 200
@@ -587,6 +816,21 @@ def cleanup_charts():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/cache-stats')
+def cache_stats():
+    """Hit/miss counters and size of the on-disk response caches."""
+    auth_token = request.headers.get('X-Auth-Token') or request.args.get('auth_token')
+    expected_token = os.environ.get('CRON_AUTH_TOKEN')
+
+    if not expected_token or auth_token != expected_token:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    return jsonify({
+        'llm': llm_cache_stats(),
+        'search': search_cache_stats(),
+        'pages': page_cache.stats(),
+        'charts': chart_store_stats(),
+    }), 200
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""
+Content-addressed store for rendered stock charts (DATA_DIR/static/charts).
+
+Each PNG is written once under a name derived from its ticker, period, run date
+and content hash, so a digest's chart URL never changes what it points at and
+can be cached forever. A SQLite manifest (DATA_DIR/charts.db) records every
+file, which lets retention run as an indexed delete instead of a directory scan.
+"""
+
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+from config import CHART_DIR, CHART_STORE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS charts (
+  filename TEXT PRIMARY KEY,
+  ticker TEXT NOT NULL,
+  period TEXT NOT NULL,
+  date TEXT NOT NULL,
+  profile TEXT,
+  bytes INTEGER NOT NULL,
+  created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_charts_date ON charts(date);
+"""
+
+# URL prefix the web app serves CHART_DIR under (it sits inside STATIC_DIR)
+URL_PREFIX = "/static/charts/"
+
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CHART_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(CHART_STORE_PATH, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL;')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def chart_url(filename: str) -> str:
+    return URL_PREFIX + filename
+
+
+def save_chart(png: bytes, ticker: str, period: str, date: str, profile: str = "") -> Dict[str, Any]:
+    """
+    Store a rendered chart and return {'filename', 'path', 'url', 'bytes'}.
+    Saving identical bytes again for the same ticker/period/date is a no-op.
+    """
+    digest = hashlib.sha256(png).hexdigest()[:16]
+    filename = f"{ticker}_{period}_{date}_{digest}.png"
+    path = os.path.join(CHART_DIR, filename)
+    if not os.path.exists(path):
+        os.makedirs(CHART_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+    conn = _get_conn()
+    with conn:
+        conn.execute(
+            'INSERT OR IGNORE INTO charts (filename, ticker, period, date, profile, bytes, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (filename, ticker, period, date, profile, len(png), time.time())
+        )
+    return {'filename': filename, 'path': path, 'url': chart_url(filename), 'bytes': len(png)}
+
+
+def prune_charts(before: str) -> int:
+    """Delete charts dated before `before` (YYYY-MM-DD); returns how many were removed."""
+    conn = _get_conn()
+    doomed: List[str] = [r[0] for r in conn.execute('SELECT filename FROM charts WHERE date < ?', (before,))]
+    for filename in doomed:
+        try:
+            os.remove(os.path.join(CHART_DIR, filename))
+        except FileNotFoundError:
+            pass
+    with conn:
+        conn.execute('DELETE FROM charts WHERE date < ?', (before,))
+    return len(doomed)
+
+
+def prune_legacy_charts(directory: str, max_age_days: int) -> int:
+    """
+    Delete charts from before the store ({ticker}_7d.png directly in directory)
+    last written more than max_age_days ago; returns how many were removed.
+    """
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in glob.glob(os.path.join(directory, "*_7d.png")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def chart_store_stats() -> Dict[str, Any]:
+    conn = _get_conn()
+    count, size, oldest, newest = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(bytes), 0), MIN(date), MAX(date) FROM charts'
+    ).fetchone()
+    return {'charts': count, 'bytes': size, 'oldest': oldest, 'newest': newest}
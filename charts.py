@@ -0,0 +1,151 @@
+"""
+Stock chart rendering off the main process.
+
+Charts are drawn with the Agg backend in a spawned process pool, so the
+mplcyberpunk glow pass neither holds the web server's GIL nor races on
+pyplot's global state. Output resolution comes from named profiles
+(see CHART_PROFILES in config.py). Workers hand back PNG bytes and the parent
+files them in chart_store under content-addressed, dated names.
+"""
+
+import concurrent.futures
+import io
+import multiprocessing
+import threading
+import time
+from datetime import datetime
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from chart_store import save_chart
+from config import CHART_PROFILES, CHART_WORKERS
+
+# Guards in-process renders (fallback path); pool workers are single-threaded
+_inline_lock = threading.Lock()
+
+
+def chart_job(ticker: str, data: Any, name: Optional[str] = None, period: str = "7d", date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Describe one chart as plain lists so it pickles cheaply into a worker.
+    date (YYYY-MM-DD, default today) is the run the chart belongs to.
+    """
+    return {
+        'ticker': ticker,
+        'name': name or ticker,
+        'period': period,
+        'date': date or datetime.now().strftime('%Y-%m-%d'),
+        'dates': list(data.index.to_pydatetime()),
+        'closes': [float(v) for v in data["Close"]],
+    }
+
+
+def _profile(profile: str) -> Tuple[Tuple[float, float], int]:
+    spec = CHART_PROFILES.get(profile) or CHART_PROFILES["email"]
+    return tuple(spec["size"]), int(spec["dpi"])
+
+
+def _render(job: Dict[str, Any], size: Tuple[float, float], dpi: int) -> Dict[str, Any]:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import mplcyberpunk
+
+    started = time.perf_counter()
+    name, period, closes = job['name'], job['period'], job['closes']
+    plt.style.use("cyberpunk")
+    fig, ax = plt.subplots(figsize=size)
+    try:
+        ax.plot(job['dates'], closes, label=f"{name} Closing Price", linewidth=2.2)
+        if closes:
+            pct_change = ((closes[-1] - closes[0]) / closes[0]) * 100
+            period_text = "7-Day" if period == "7d" else period.upper()
+            ax.set_title(f"{name} – {period_text} Trend ({pct_change:+.2f}%)", fontsize=14)
+        else:
+            ax.set_title(f"{name} – {period.upper()} Trend", fontsize=14)
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Price (Local)")
+        ax.legend()
+        mplcyberpunk.add_glow_effects(ax=ax)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=dpi)
+    finally:
+        plt.close(fig)
+    return {
+        'ticker': job['ticker'],
+        'png': buf.getvalue(),
+        'dpi': dpi,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _render_inline(job: Dict[str, Any], size: Tuple[float, float], dpi: int) -> Dict[str, Any]:
+    with _inline_lock:
+        return _render(job, size, dpi)
+
+
+def _store(job: Dict[str, Any], rendered: Dict[str, Any], profile: str) -> Dict[str, Any]:
+    stored = save_chart(rendered['png'], job['ticker'], job['period'], job['date'], profile)
+    return {
+        'ticker': job['ticker'],
+        'path': stored['path'],
+        'url': stored['url'],
+        'dpi': rendered['dpi'],
+        'seconds': rendered['seconds'],
+        'bytes': stored['bytes'],
+    }
+
+
+def render_chart(job: Dict[str, Any], profile: str = "email") -> Dict[str, Any]:
+    """Render and store a single chart in this process."""
+    size, dpi = _profile(profile)
+    res = _store(job, _render_inline(job, size, dpi), profile)
+    _report(res, profile)
+    return res
+
+
+def _report(res: Dict[str, Any], profile: str) -> None:
+    print(f"   🖼️ {res['ticker']}: {res['seconds'] * 1000:.0f} ms, {res['bytes'] / 1024:.0f} KB ({profile} @ {res['dpi']} dpi)", flush=True)
+
+
+def render_charts(jobs: Sequence[Dict[str, Any]], profile: str = "email", max_workers: int = CHART_WORKERS) -> Dict[str, Dict[str, Any]]:
+    """
+    Render charts in a process pool and file them in chart_store. Returns
+    {ticker: {'path', 'url', 'dpi', 'seconds', 'bytes'}} for every chart that
+    rendered; failures are logged and left out.
+    """
+    if not jobs:
+        return {}
+    size, dpi = _profile(profile)
+    started = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def _keep(job: Dict[str, Any], render: Any) -> None:
+        try:
+            res = _store(job, render(), profile)
+        except BrokenProcessPool:
+            print(f"   ⚠️ Chart pool unavailable, rendering {job['ticker']} in-process", flush=True)
+            _keep(job, lambda: _render_inline(job, size, dpi))
+            return
+        except Exception as e:
+            print(f"  ✗ Error generating chart for {job['ticker']}: {e}", flush=True)
+            return
+        results[job['ticker']] = res
+        _report(res, profile)
+
+    workers = max(1, min(max_workers, len(jobs)))
+    if workers == 1:
+        for job in jobs:
+            _keep(job, lambda job=job: _render_inline(job, size, dpi))
+    else:
+        # spawn, not fork: the web app has live threads and SQLite handles. Workers
+        # re-import the entry script as __mp_main__, so app.py keeps init_app() off that path
+        ctx = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+            futures = [ex.submit(_render, job, size, dpi) for job in jobs]
+            for job, fut in zip(jobs, futures):
+                _keep(job, fut.result)
+
+    total = sum(r['bytes'] for r in results.values())
+    print(f"🖼️ Rendered {len(results)}/{len(jobs)} charts in {time.perf_counter() - started:.1f}s, {total / 1024:.0f} KB total", flush=True)
+    return results
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from config import OPENAI_API_KEY, GOOGLE_API_KEY
 import google.generativeai as genai
 
@@ -12,3 +12,6 @@ gemini_client = genai.Client(api_key=GOOGLE_API_KEY)
 # Configure OpenAI client
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Async OpenAI client for llm_core.acall_openai (Gemini's async surface is gemini_client.aio)
+async_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
@@ -32,3 +32,86 @@ else:
 DATA_DIR = os.getenv("DATA_DIR", "/data" if os.path.exists("/data") else "./data")
 DATABASE_PATH = os.path.join(DATA_DIR, "newsai.db")
 STATIC_DIR = os.path.join(DATA_DIR, "static")
+
+# Concurrency limits for outbound LLM calls (slots per provider, shared process-wide)
+LLM_MAX_CONCURRENCY = {
+    "openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "6")),
+    "perplexity": int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", "6")),
+    "gemini": int(os.getenv("GEMINI_MAX_CONCURRENCY", "6")),
+}
+# Worker threads for the section x provider news fan-out
+NEWS_FANOUT_WORKERS = int(os.getenv("NEWS_FANOUT_WORKERS", "18"))
+
+# LLM response cache (SQLite, content-addressed on provider/model/messages/schema/tools)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false"
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.db")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
+# Per call-site freshness, in seconds. Search prompts embed today's date, so
+# those entries never carry across days; the TTL only bounds same-day reuse.
+LLM_CACHE_TTLS = {
+    "news_search": 12 * 3600,
+    "refine": 12 * 3600,
+    "stock_research": 24 * 3600,
+}
+# SerpAPI search cache (SQLite, keyed on normalized engine + query params)
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() != "false"
+SEARCH_CACHE_PATH = os.path.join(DATA_DIR, "search_cache.db")
+SEARCH_CACHE_MAX_MB = int(os.getenv("SEARCH_CACHE_MAX_MB", "32"))
+# Fresh results are reused for a day; empty results are retried sooner
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+SEARCH_CACHE_NEGATIVE_TTL = int(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", str(3 * 3600)))
+# Local daily price store; only bars after the last stored date are downloaded
+PRICE_STORE_PATH = os.path.join(DATA_DIR, "prices.db")
+PRICE_HISTORY_DAYS = int(os.getenv("PRICE_HISTORY_DAYS", "400"))
+# yfinance fundamentals (ticker.info, recommendations): fresh for the TTL, then served
+# stale while a background refresh runs, up to MAX_STALE old
+FUNDAMENTALS_CACHE_PATH = os.path.join(DATA_DIR, "fundamentals_cache.db")
+FUNDAMENTALS_CACHE_MAX_MB = int(os.getenv("FUNDAMENTALS_CACHE_MAX_MB", "16"))
+FUNDAMENTALS_TTL = int(os.getenv("FUNDAMENTALS_TTL", str(24 * 3600)))
+FUNDAMENTALS_MAX_STALE = int(os.getenv("FUNDAMENTALS_MAX_STALE", str(30 * 24 * 3600)))
+# One-off migration: move digests stored as a single data_json blob into compressed
+# parts (digest_parts) at startup. Off by default; each digest is read back and
+# compared before its data_json is cleared.
+COMPACT_LEGACY_DIGESTS = os.getenv("COMPACT_LEGACY_DIGESTS", "false").lower() == "true"
+# Rendered digest pages kept in memory by the web app
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "64"))
+# Pooled outbound HTTP (see http_client.py); timeouts are per host, in seconds
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+HTTP_TIMEOUTS = {
+    "api.perplexity.ai": float(os.getenv("PERPLEXITY_TIMEOUT", "30")),
+    "serpapi.com": float(os.getenv("SERPAPI_TIMEOUT", "30")),
+    "www.google.com": float(os.getenv("GOOGLE_SCRAPE_TIMEOUT", "15")),
+}
+# Tickers processed concurrently in the weekly stock run (LLM calls inside
+# them still share the per-provider limits above)
+STOCK_MAX_WORKERS = int(os.getenv("STOCK_MAX_WORKERS", "4"))
+# Stock charts render in a process pool (charts.py). Profiles share one figure
+# size so layout is identical; only pixel density differs.
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "4"))
+_CHART_SIZE = (10, 4)
+CHART_PROFILES = {
+    "email": {"size": _CHART_SIZE, "dpi": int(os.getenv("CHART_EMAIL_DPI", "80"))},
+    "web": {"size": _CHART_SIZE, "dpi": int(os.getenv("CHART_WEB_DPI", "120"))},
+    "retina": {"size": _CHART_SIZE, "dpi": int(os.getenv("CHART_RETINA_DPI", "200"))},
+}
+# Rendered charts are stored by content hash and run date under STATIC_DIR/charts,
+# indexed in a SQLite manifest; charts older than the retention are pruned
+CHART_DIR = os.path.join(STATIC_DIR, "charts")
+CHART_STORE_PATH = os.path.join(DATA_DIR, "charts.db")
+CHART_RETENTION_DAYS = int(os.getenv("CHART_RETENTION_DAYS", "30"))
+CHART_EMAIL_PROFILE = os.getenv("CHART_EMAIL_PROFILE", "email")
+CHART_WEB_PROFILE = os.getenv("CHART_WEB_PROFILE", "web")
+# Local near-duplicate clustering before refine_articles (dedup.py): MinHash over
+# character shingles of title + summary; articles at or above the estimated
+# Jaccard threshold are treated as the same story
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+DEDUP_NUM_PERM = 64
+DEDUP_SHINGLE_SIZE = 5
+# Cross-day seen-story index (seen_stories table): verification outcomes and
+# first publication date per story, forgotten after this many days unseen
+SEEN_STORIES_RETENTION_DAYS = int(os.getenv("SEEN_STORIES_RETENTION_DAYS", "14"))
+# Concurrent SerpAPI article verifications per section
+VERIFY_MAX_WORKERS = int(os.getenv("VERIFY_MAX_WORKERS", "8"))
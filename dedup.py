@@ -0,0 +1,197 @@
+"""
+Local near-duplicate detection for news articles.
+
+Each article's title + summary is cut into character shingles and MinHashed;
+LSH banding over the signatures means only likely pairs get compared. Articles
+that share a canonical URL, a normalized title, or an estimated Jaccard
+similarity of at least DEDUP_THRESHOLD land in the same cluster, and one
+representative per cluster is kept. assign_sections does this digest-wide
+before verification, so a story is verified and refined in one section only;
+dedupe_articles runs again per section before refine_articles.
+"""
+
+import random
+import re
+import zlib
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config import DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+from url_canon import url_key
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# (a, b) pairs for the universal hashes h(x) = (a*x + b) mod p, fixed so signatures are stable across runs
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(DEDUP_NUM_PERM)]
+# 16 bands of 4 rows puts the LSH candidate threshold near a Jaccard of 0.5
+_BANDS = 16
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def shingles(text: str, k: int = DEDUP_SHINGLE_SIZE) -> Set[int]:
+    norm = normalize_text(text)
+    if len(norm) <= k:
+        return {zlib.crc32(norm.encode("utf-8"))} if norm else set()
+    return {zlib.crc32(norm[i:i + k].encode("utf-8")) for i in range(len(norm) - k + 1)}
+
+
+def minhash(hashes: Iterable[int]) -> Tuple[int, ...]:
+    values = list(hashes)
+    if not values:
+        return ()
+    return tuple(min((a * x + b) % _PRIME for x in values) for a, b in _PERMUTATIONS)
+
+
+def article_signature(article: Dict[str, Any]) -> Tuple[int, ...]:
+    return minhash(shingles(f"{article.get('title', '')} {article.get('summary', '')}"))
+
+
+def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def candidate_pairs(signatures: Sequence[Tuple[int, ...]]) -> Set[Tuple[int, int]]:
+    """Index pairs sharing at least one LSH band bucket."""
+    rows = max(1, DEDUP_NUM_PERM // _BANDS)
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    for idx, sig in enumerate(signatures):
+        if not sig:
+            continue
+        for band in range(_BANDS):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(idx)
+    pairs: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                pairs.add((a, b))
+    return pairs
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        # Keep the earlier index as root so clusters are ordered by first appearance
+        if rb < ra:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        return True
+
+
+def cluster_articles(
+    articles: Sequence[Dict[str, Any]],
+    threshold: float = DEDUP_THRESHOLD,
+    signatures: Optional[Sequence[Tuple[int, ...]]] = None,
+) -> Tuple[List[List[int]], Dict[str, int]]:
+    """
+    Group article indexes into near-duplicate clusters, ordered by first member.
+    Returns (clusters, {'url': n, 'title': n, 'minhash': n}) counting the merges per rule.
+    """
+    n = len(articles)
+    uf = _UnionFind(n)
+    merges = {'url': 0, 'title': 0, 'minhash': 0}
+
+    for rule, key_of in (('url', lambda a: url_key(a.get('url', ''))),
+                         ('title', lambda a: normalize_text(a.get('title', '')))):
+        first: Dict[str, int] = {}
+        for idx, article in enumerate(articles):
+            key = key_of(article)
+            if not key:
+                continue
+            if key in first:
+                merges[rule] += uf.union(first[key], idx)
+            else:
+                first[key] = idx
+
+    sigs = signatures if signatures is not None else [article_signature(a) for a in articles]
+    for a, b in sorted(candidate_pairs(sigs)):
+        if uf.find(a) != uf.find(b) and similarity(sigs[a], sigs[b]) >= threshold:
+            merges['minhash'] += uf.union(a, b)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(n):
+        groups[uf.find(idx)].append(idx)
+    return [groups[root] for root in sorted(groups)], merges
+
+
+def pick_representative(articles: Sequence[Dict[str, Any]], members: Sequence[int]) -> int:
+    """Prefer a search-verified article, then one with a URL, then the fuller summary; ties go to the earliest."""
+    def _score(idx: int) -> Tuple[bool, bool, int, int]:
+        a = articles[idx]
+        return (bool(a.get('verified')), bool(a.get('url')), len(a.get('summary') or ''), -idx)
+    return max(members, key=_score)
+
+
+def dedupe_articles(articles: List[Dict[str, Any]], threshold: float = DEDUP_THRESHOLD) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Keep one representative per near-duplicate cluster, in first-seen order; returns (articles, stats)."""
+    if not articles:
+        return [], {'input': 0, 'kept': 0, 'dropped': 0, 'largest_cluster': 0, 'merges': {'url': 0, 'title': 0, 'minhash': 0}}
+    clusters, merges = cluster_articles(articles, threshold)
+    kept = [articles[pick_representative(articles, members)] for members in clusters]
+    stats = {
+        'input': len(articles),
+        'kept': len(kept),
+        'dropped': len(articles) - len(kept),
+        'largest_cluster': max(len(m) for m in clusters),
+        'merges': merges,
+    }
+    return kept, stats
+
+
+def assign_sections(
+    articles_by_section: Dict[str, List[Dict[str, Any]]],
+    section_order: Sequence[str],
+    threshold: float = DEDUP_THRESHOLD,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Cluster every section's candidates together and give each story to one section.
+    The section holding most copies of a story wins; ties go to the section listed
+    first in section_order, which runs from most to least specific.
+    Returns ({section: articles}, stats).
+    """
+    flat: List[Dict[str, Any]] = []
+    origin: List[str] = []
+    for sec in section_order:
+        for article in articles_by_section.get(sec, []):
+            flat.append(article)
+            origin.append(sec)
+
+    clusters, merges = cluster_articles(flat, threshold)
+    rank = {sec: i for i, sec in enumerate(section_order)}
+    placed: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {sec: [] for sec in section_order}
+    cross_section = 0
+    for members in clusters:
+        votes = Counter(origin[i] for i in members)
+        best = min(votes, key=lambda sec: (-votes[sec], rank[sec]))
+        if len(votes) > 1:
+            cross_section += 1
+        first_in_best = min(i for i in members if origin[i] == best)
+        placed[best].append((first_in_best, flat[pick_representative(flat, members)]))
+
+    assigned = {sec: [a for _, a in sorted(items, key=lambda item: item[0])] for sec, items in placed.items()}
+    stats = {
+        'input': len(flat),
+        'kept': len(clusters),
+        'cross_section_stories': cross_section,
+        'merges': merges,
+        'sections': {sec: (len(articles_by_section.get(sec, [])), len(assigned[sec])) for sec in section_order},
+    }
+    return assigned, stats
@@ -0,0 +1,164 @@
+"""
+Small SQLite-backed key/value cache with per-entry TTLs, size-bounded LRU
+eviction and hit/miss counters. Values are stored as JSON.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict
+
+MISSING = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL,
+  size_bytes INTEGER NOT NULL,
+  created_at REAL NOT NULL,
+  expires_at REAL NOT NULL,
+  last_access REAL NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries(last_access);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at);
+"""
+
+
+def _jsonable(obj: Any) -> Any:
+    # SDK objects (e.g. google.genai types.Tool) are pydantic models
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", exclude_none=True)
+    return repr(obj)
+
+
+def make_key(*parts: Any) -> str:
+    """Content-address a request: sha256 over the canonical JSON of its parts."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_jsonable)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ready = False
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute('PRAGMA journal_mode=WAL;')
+                    conn.executescript(SCHEMA)
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        now = time.time()
+        try:
+            conn = self._get_conn()
+        except sqlite3.Error:
+            return default
+        try:
+            row = conn.execute('SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)).fetchone()
+            if row is None or row[1] <= now:
+                with self._lock:
+                    self._misses += 1
+                return default
+            conn.execute('UPDATE cache_entries SET last_access = ?, hits = hits + 1 WHERE key = ?', (now, key))
+            conn.commit()
+            with self._lock:
+                self._hits += 1
+            return json.loads(row[0])
+        except sqlite3.Error:
+            return default
+        finally:
+            conn.close()
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        blob = json.dumps(value, ensure_ascii=False)
+        try:
+            conn = self._get_conn()
+        except sqlite3.Error:
+            return
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, size_bytes, created_at, expires_at, last_access, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0)',
+                (key, blob, len(blob.encode("utf-8")), now, now + ttl, now)
+            )
+            self._evict(conn, now)
+            conn.commit()
+            with self._lock:
+                self._writes += 1
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        removed = conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,)).rowcount
+        total = conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries').fetchone()[0]
+        if total > self.max_bytes:
+            # Drop least-recently-used entries until we are back under the bound
+            cur = conn.execute('SELECT key, size_bytes FROM cache_entries ORDER BY last_access ASC')
+            doomed = []
+            for key, size in cur:
+                if total <= self.max_bytes:
+                    break
+                doomed.append((key,))
+                total -= size
+            conn.executemany('DELETE FROM cache_entries WHERE key = ?', doomed)
+            removed += len(doomed)
+        if removed:
+            with self._lock:
+                self._evictions += removed
+
+    def clear(self) -> None:
+        conn = self._get_conn()
+        try:
+            conn.execute('DELETE FROM cache_entries')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {
+                'hits': self._hits,
+                'misses': self._misses,
+                'writes': self._writes,
+                'evictions': self._evictions,
+            }
+        lookups = out['hits'] + out['misses']
+        out['hit_rate'] = round(out['hits'] / lookups, 3) if lookups else 0.0
+        out['max_bytes'] = self.max_bytes
+        try:
+            conn = self._get_conn()
+            try:
+                entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM cache_entries').fetchone()
+            finally:
+                conn.close()
+            out['entries'] = entries
+            out['bytes'] = size
+        except sqlite3.Error:
+            out['entries'] = None
+            out['bytes'] = None
+        return out
+
+
+def open_cache(path: str, max_mb: int) -> DiskCache:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return DiskCache(path, max_bytes=max_mb * 1024 * 1024)
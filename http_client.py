@@ -0,0 +1,98 @@
+"""
+Shared pooled HTTP clients for outbound REST calls.
+
+Blocking calls go through one requests.Session per host, each with its own
+keep-alive connection pool, retry/backoff policy and default timeout, so
+repeated calls to the same API reuse warm connections. Async callers get one
+pooled httpx.AsyncClient per event loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HTTP_POOL_MAXSIZE, HTTP_RETRIES, HTTP_BACKOFF, HTTP_TIMEOUTS, HTTP_DEFAULT_TIMEOUT
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # Only idempotent requests are retried on read errors / bad statuses;
+        # connection failures are retried for every method
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Pooled Session for the url's host."""
+    host = urlsplit(url).netloc.lower()
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _sessions[host] = _new_session()
+    return session
+
+
+def host_timeout(url: str) -> float:
+    return HTTP_TIMEOUTS.get(urlsplit(url).netloc.lower(), HTTP_DEFAULT_TIMEOUT)
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Like requests.request, over the host's pooled session and default timeout."""
+    kwargs.setdefault("timeout", host_timeout(url))
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+# httpx.AsyncClient pools are bound to the loop that created them
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared pooled AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    http = _async_http_clients.get(loop)
+    if http is None or http.is_closed:
+        http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=httpx.Timeout(HTTP_DEFAULT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=HTTP_RETRIES),
+        )
+        _async_http_clients[loop] = http
+    return http
+
+
+async def aclose_http_clients() -> None:
+    """Close the running loop's pooled AsyncClient; call before the loop shuts down."""
+    loop = asyncio.get_running_loop()
+    http = _async_http_clients.pop(loop, None)
+    if http is not None:
+        await http.aclose()
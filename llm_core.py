@@ -1,23 +1,52 @@
 """
 Core LLM API call mechanics - handles the low-level API interactions.
 The main scripts will handle prompt modifications and then call these functions.
+
+Each provider has a blocking call_* function and an asyncio-native acall_*
+counterpart. Both share the same request builders, so a prompt produces the
+same request on either path. Passing cache_ttl serves repeat requests from the
+on-disk response cache (keyed on the full request, never the API key).
 """
 
+import asyncio
 import json
-import requests
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from google.genai import types
 from json_helpers import extract_json_from_text
+from parallel import provider_slot, async_provider_slot
+import http_client
+from http_client import get_async_http_client
+from disk_cache import MISSING, make_key, open_cache
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_MB
 
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
 
-def call_openai(
-    client: Any,
+_llm_cache = open_cache(LLM_CACHE_PATH, LLM_CACHE_MAX_MB)
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    return _llm_cache.stats()
+
+
+def _cache_lookup(cache_ttl: Optional[float], key_parts: Tuple[Any, ...]) -> Tuple[Optional[str], Any]:
+    if not cache_ttl or not LLM_CACHE_ENABLED:
+        return None, MISSING
+    key = make_key(*key_parts)
+    return key, _llm_cache.get(key)
+
+
+def _cache_store(key: Optional[str], cache_ttl: Optional[float], data: Any) -> None:
+    if key is not None:
+        _llm_cache.put(key, data, cache_ttl)
+
+
+def _openai_params(
     messages: List[Dict[str, str]],
     model: str,
-    tools: Optional[List[Dict]] = None,
-    json_schema: Optional[Dict] = None,
-    background: bool = False,
-    reasoning_effort: str = "high",
+    tools: Optional[List[Dict]],
+    json_schema: Optional[Dict],
+    background: bool,
+    reasoning_effort: str,
 ) -> Dict[str, Any]:
     params: Dict[str, Any] = {
         "model": model,
@@ -36,20 +65,10 @@ def call_openai(
             }
         }
         params["reasoning"] = {"effort": reasoning_effort}
-
-    resp = client.responses.create(**params)
-    text = resp.output_text
-    data = json.loads(extract_json_from_text(text))
-    return data
+    return params
 
 
-def call_perplexity(
-    api_key: str,
-    messages: List[Dict[str, str]],
-    model: str,
-    json_schema: Optional[Dict] = None,
-    timeout: int = 30,
-) -> Any:
+def _perplexity_request(api_key: str, messages: List[Dict[str, str]], model: str, json_schema: Optional[Dict]) -> Tuple[Dict[str, str], Dict[str, Any]]:
     payload: Dict[str, Any] = {
         "model": model,
         "messages": messages,
@@ -59,27 +78,18 @@ def call_perplexity(
             "type": "json_schema",
             "json_schema": {"schema": json_schema["schema"]},
         }
-
-    r = requests.post(
-        "https://api.perplexity.ai/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json=payload,
-        timeout=timeout,
-    )
-    r.raise_for_status()
-    return json.loads(r.json()["choices"][0]["message"]["content"])
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    return headers, payload
 
 
-def call_gemini(
-    client: Any,
+def _gemini_request(
     messages: List[Dict[str, str]],
-    model: str,
-    tools: Optional[List] = None,
-    json_instruction: Optional[str] = None,
-) -> Any:
+    tools: Optional[List],
+    json_instruction: Optional[str],
+) -> Tuple[str, Any]:
     if tools is None:
         tools = [types.Tool(google_search=types.GoogleSearch())]
     if json_instruction is None:
@@ -93,10 +103,136 @@ def call_gemini(
         tools=tools,
     )
     user_content = messages[1]["content"] if len(messages) > 1 else messages[0]["content"]
+    return user_content + json_instruction, config
 
-    resp = client.models.generate_content(
-        model=model,
-        contents=user_content + json_instruction,
-        config=config,
-    )
-    return json.loads(extract_json_from_text(resp.text.strip()))
\ No newline at end of file
+
+def call_openai(
+    client: Any,
+    messages: List[Dict[str, str]],
+    model: str,
+    tools: Optional[List[Dict]] = None,
+    json_schema: Optional[Dict] = None,
+    background: bool = False,
+    reasoning_effort: str = "high",
+    cache_ttl: Optional[float] = None,
+) -> Dict[str, Any]:
+    params = _openai_params(messages, model, tools, json_schema, background, reasoning_effort)
+    key, data = _cache_lookup(cache_ttl, ("openai", params))
+    if data is not MISSING:
+        return data
+    with provider_slot("openai"):
+        resp = client.responses.create(**params)
+    text = resp.output_text
+    data = json.loads(extract_json_from_text(text))
+    _cache_store(key, cache_ttl, data)
+    return data
+
+
+def call_perplexity(
+    api_key: str,
+    messages: List[Dict[str, str]],
+    model: str,
+    json_schema: Optional[Dict] = None,
+    timeout: int = 30,
+    cache_ttl: Optional[float] = None,
+) -> Any:
+    headers, payload = _perplexity_request(api_key, messages, model, json_schema)
+    key, data = _cache_lookup(cache_ttl, ("perplexity", payload))
+    if data is not MISSING:
+        return data
+    with provider_slot("perplexity"):
+        r = http_client.post(PERPLEXITY_URL, headers=headers, json=payload, timeout=timeout)
+    r.raise_for_status()
+    data = json.loads(r.json()["choices"][0]["message"]["content"])
+    _cache_store(key, cache_ttl, data)
+    return data
+
+
+def call_gemini(
+    client: Any,
+    messages: List[Dict[str, str]],
+    model: str,
+    tools: Optional[List] = None,
+    json_instruction: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+) -> Any:
+    contents, config = _gemini_request(messages, tools, json_instruction)
+    key, data = _cache_lookup(cache_ttl, ("gemini", model, contents, config))
+    if data is not MISSING:
+        return data
+    with provider_slot("gemini"):
+        resp = client.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+    data = json.loads(extract_json_from_text(resp.text.strip()))
+    _cache_store(key, cache_ttl, data)
+    return data
+
+
+async def acall_openai(
+    client: Any,
+    messages: List[Dict[str, str]],
+    model: str,
+    tools: Optional[List[Dict]] = None,
+    json_schema: Optional[Dict] = None,
+    background: bool = False,
+    reasoning_effort: str = "high",
+    cache_ttl: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Async call_openai; client must be an openai.AsyncOpenAI (see clients.async_client)."""
+    params = _openai_params(messages, model, tools, json_schema, background, reasoning_effort)
+    key, data = await asyncio.to_thread(_cache_lookup, cache_ttl, ("openai", params))
+    if data is not MISSING:
+        return data
+    async with async_provider_slot("openai"):
+        resp = await client.responses.create(**params)
+    data = json.loads(extract_json_from_text(resp.output_text))
+    await asyncio.to_thread(_cache_store, key, cache_ttl, data)
+    return data
+
+
+async def acall_perplexity(
+    api_key: str,
+    messages: List[Dict[str, str]],
+    model: str,
+    json_schema: Optional[Dict] = None,
+    timeout: int = 30,
+    cache_ttl: Optional[float] = None,
+) -> Any:
+    """Async call_perplexity over the loop's shared pooled AsyncClient."""
+    headers, payload = _perplexity_request(api_key, messages, model, json_schema)
+    key, data = await asyncio.to_thread(_cache_lookup, cache_ttl, ("perplexity", payload))
+    if data is not MISSING:
+        return data
+    async with async_provider_slot("perplexity"):
+        r = await get_async_http_client().post(PERPLEXITY_URL, headers=headers, json=payload, timeout=timeout)
+    r.raise_for_status()
+    data = json.loads(r.json()["choices"][0]["message"]["content"])
+    await asyncio.to_thread(_cache_store, key, cache_ttl, data)
+    return data
+
+
+async def acall_gemini(
+    client: Any,
+    messages: List[Dict[str, str]],
+    model: str,
+    tools: Optional[List] = None,
+    json_instruction: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+) -> Any:
+    """Async call_gemini; takes the regular genai.Client and uses its .aio surface."""
+    contents, config = _gemini_request(messages, tools, json_instruction)
+    key, data = await asyncio.to_thread(_cache_lookup, cache_ttl, ("gemini", model, contents, config))
+    if data is not MISSING:
+        return data
+    async with async_provider_slot("gemini"):
+        resp = await client.aio.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+    data = json.loads(extract_json_from_text(resp.text.strip()))
+    await asyncio.to_thread(_cache_store, key, cache_ttl, data)
+    return data
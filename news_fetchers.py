@@ -3,12 +3,21 @@ News API fetching utilities.
 """
 
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import concurrent.futures
+import threading
+import time
 from newsapi import NewsApiClient
 from newsdataapi.newsdataapi_client import NewsDataApiClient
 from json_helpers import format_json_schema
 from llm_core import call_openai, call_perplexity, call_gemini
+from parallel import run_bounded
+from search_cache import serpapi_search
+from dedup import assign_sections, dedupe_articles
+from url_canon import canonicalize, url_key
+from storage import record_story_verifications, seen_stories_among, story_key, touch_seen_stories
+import http_client
+from config import NEWS_FANOUT_WORKERS, LLM_CACHE_TTLS, VERIFY_MAX_WORKERS
 import json
 
 
@@ -55,6 +64,14 @@ def fetch_newsdata_articles(newsdata_client: NewsDataApiClient, section: str, qu
         return [{"title": "NewsDataAPI Error", "summary": str(e), "url": "", "source": "NewsDataAPI", "date": "", "client": "NewsDataAPI"}]
 
 
+def _canonicalize_urls(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rewrite article URLs to their canonical form at ingestion (see url_canon)."""
+    for article in articles:
+        if article.get("url"):
+            article["url"] = canonicalize(article["url"])
+    return articles
+
+
 def fetch_news_from_multiple_apis(section: str, query: str, newsapi_client: Optional[NewsApiClient], newsdata_client: Optional[NewsDataApiClient], days_back: int = 3) -> List[Dict[str, Any]]:
     today = datetime.now()
     start_date = (today - timedelta(days=days_back)).strftime("%Y-%m-%d")
@@ -75,24 +92,110 @@ def fetch_news_from_multiple_apis(section: str, query: str, newsapi_client: Opti
         fut2 = ex.submit(_newsdata_call)
         concurrent.futures.wait([fut1, fut2])
     
-    return collected
+    return _canonicalize_urls(collected)
+
+
+def _search_window_days(days_back: int) -> int:
+    # Flexible date tolerance: if looking for 3 days, allow up to 7 days
+    return max(days_back * 2, 7)
+
+
+def _reusable_verification(entry: Dict[str, Any], article: Dict[str, Any], run_date: str, days_back: int) -> bool:
+    """
+    Whether an earlier run's positive verification still holds for this article:
+    same canonical URL, and the verified date passes the checks a fresh search
+    would apply today (inside the search window, close to the claimed date).
+    """
+    if not entry['verified'] or article.get('verified'):
+        return False
+    if not entry['url_key'] or entry['url_key'] != url_key(article.get('original_url') or article.get('url') or ''):
+        return False
+    verified_date = entry['verification'].get('verified_date')
+    if not verified_date:
+        # Undated matches were only bounded by that day's search window
+        return entry['verified_on'] == run_date
+    try:
+        found = datetime.fromisoformat(verified_date)
+        run_day = datetime.fromisoformat(run_date)
+    except ValueError:
+        # Outcomes recorded with a relative date ("2 days ago") can't be re-checked
+        return False
+    if (run_day - found).days > _search_window_days(days_back):
+        return False
+    return check_date_match(article.get('date', ''), verified_date, tolerance_days=3)['close_match']
+
+
+def annotate_seen_stories(articles_by_section: Dict[str, List[Dict[str, Any]]], run_date: str, days_back: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Consult the cross-day seen-story index right after fetch.
+    Stories an earlier run verified at the same URL, whose verified date still
+    falls inside today's search window, get that outcome back (and skip the search
+    in check_articles_for_hallucinations); stories already published before
+    run_date are tagged 'previously_published' and moved to the end of their
+    section. Every matched story's last_seen moves up to run_date.
+    """
+    seen = seen_stories_among([a for items in articles_by_section.values() for a in items])
+    reused = demoted = 0
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for section, items in articles_by_section.items():
+        fresh, published = [], []
+        for article in items:
+            entry = seen.get(story_key(article))
+            if entry and _reusable_verification(entry, article, run_date, days_back):
+                article.update(entry['verification'])
+                article['verified'] = True
+                article['verification_reused_from'] = entry['verified_on']
+                reused += 1
+            if entry and entry['published_on'] and entry['published_on'] < run_date:
+                article['previously_published'] = entry['published_on']
+                published.append(article)
+                demoted += 1
+            else:
+                fresh.append(article)
+        out[section] = fresh + published
+    try:
+        touch_seen_stories(run_date, [entry['title_key'] for entry in seen.values()])
+    except Exception as e:
+        print(f"   ⚠️ Could not update seen stories: {e}", flush=True)
+    if reused or demoted:
+        print(f"♻️ Seen stories: {reused} verifications reused, {demoted} already published (demoted)", flush=True)
+    return out
+
+
+def assign_digest_sections(articles_by_section: Dict[str, List[Dict[str, Any]]], section_order: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Digest-wide dedup: each story keeps one copy, in its best-fit section, before verification."""
+    assigned, stats = assign_sections(articles_by_section, section_order)
+    print(f"🧬 Digest dedup: {stats['input']} → {stats['kept']} stories "
+          f"({stats['cross_section_stories']} shared across sections)", flush=True)
+    for sec, (before, after) in stats['sections'].items():
+        if before != after:
+            print(f"   {sec}: {before} → {after}", flush=True)
+    return assigned
 
 
 def refine_articles(articles: List[Dict[str, Any]], section: str, openai_client: Any, model: str, max_articles: int) -> List[Dict[str, Any]]:
     if not articles:
         return []
+
+    # Collapse near-duplicates locally so the LLM only ranks distinct stories
+    articles, stats = dedupe_articles(articles)
+    if stats['dropped']:
+        m = stats['merges']
+        print(f"🧬 {section}: {stats['input']} → {stats['kept']} articles after dedup "
+              f"(url {m['url']}, title {m['title']}, near-dup {m['minhash']}; largest cluster {stats['largest_cluster']})", flush=True)
     
-    # Store original URLs and verified URLs
+    # Store original URLs and verified URLs, keyed by canonical URL with title_source as fallback
     url_mapping = {}
     for article in articles:
-        # Create a unique key for each article
-        key = f"{article.get('title', '')}_{article.get('source', '')}"
-        url_mapping[key] = {
+        url_info = {
             "url": article.get("url", ""),
             "verified_url": article.get("verified_url", ""),
             "original_url": article.get("original_url", ""),
             "verified": article.get("verified", False)
         }
+        if article.get("url"):
+            url_mapping[url_key(article["url"])] = url_info
+        url_mapping.setdefault(f"{article.get('title', '')}_{article.get('source', '')}", url_info)
     
     schema = format_json_schema({
         "type": "object",
@@ -123,13 +226,15 @@ def refine_articles(articles: List[Dict[str, Any]], section: str, openai_client:
             f"Your task is to:\n"
             f"1. Identify near-duplicate articles.\n"
             f"2. Keep only one version per unique story — the most credible.\n"
-            f"3. Return at most {max_articles} relevant articles.\n\n"
+            f"3. Return at most {max_articles} relevant articles.\n"
+            f"Articles with a 'previously_published' date already ran in an earlier digest; "
+            f"only pick them when there are not enough new stories.\n\n"
             f"Return only the final selected articles in the same JSON format."
         )},
         {"role": "user", "content": f"Here are the articles for '{section}':\n\n" + json.dumps({"articles": articles})}
     ]
 
-    data = call_openai(openai_client, messages, model, json_schema=schema)
+    data = call_openai(openai_client, messages, model, json_schema=schema, cache_ttl=LLM_CACHE_TTLS["refine"])
     refined_articles = []
     
     if isinstance(data, dict):
@@ -139,9 +244,9 @@ def refine_articles(articles: List[Dict[str, Any]], section: str, openai_client:
     
     # Restore the verified URLs
     for article in refined_articles:
-        key = f"{article.get('title', '')}_{article.get('source', '')}"
-        if key in url_mapping:
-            url_info = url_mapping[key]
+        url_info = (url_mapping.get(url_key(article.get("url", ""))) if article.get("url") else None) \
+            or url_mapping.get(f"{article.get('title', '')}_{article.get('source', '')}")
+        if url_info:
             # Prefer verified URL if available
             if url_info.get("verified_url"):
                 article["url"] = url_info["verified_url"]
@@ -187,7 +292,7 @@ def validate_and_fix_urls(articles: List[Dict[str, Any]], section: str, openai_c
         {"role": "user", "content": f"Here are the articles for '{section}':\n\n" + json.dumps({"articles": articles})}
     ]
 
-    data = call_openai(openai_client, messages, model, tools=[{"type": "web_search_preview"}], json_schema=schema)
+    data = call_openai(openai_client, messages, model, tools=[{"type": "web_search_preview"}], json_schema=schema, cache_ttl=LLM_CACHE_TTLS["refine"])
     if isinstance(data, dict):
         fixed_list = data.get("articles", [])
     elif isinstance(data, list):
@@ -224,13 +329,137 @@ def is_recent_article(article: Dict[str, Any], days: int = 7) -> bool:
         return False
 
 
+_article_search_memo: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_article_search_locks: Dict[Tuple[str, int], threading.Lock] = {}
+_memo_lock = threading.Lock()
+
+
+def reset_article_search_memo() -> None:
+    """Forget memoized article lookups; call at the start of each digest run."""
+    with _memo_lock:
+        _article_search_memo.clear()
+        _article_search_locks.clear()
+
+
+def _match_news_result(article: Dict[str, Any], news_results: List[Dict[str, Any]], flexible_days: int) -> Optional[Dict[str, Any]]:
+    """First Google News result whose title and date match the article, as verification fields."""
+    title = article.get("title", "")
+    article_date = article.get("date", "")
+    # Look for exact or close match
+    for result in news_results:
+        result_title = result.get("title", "").lower()
+        result_url = result.get("link")
+        date_str = result.get("date")
+        
+        # Check title similarity
+        if (title.lower() in result_title or 
+            result_title in title.lower() or
+            # Check if most words match
+            len(set(title.lower().split()) & set(result_title.split())) > min(3, len(title.split()) // 2)):
+            
+            # Verify date is recent and matches claimed date
+            if date_str:
+                # Check if the found article is within flexible date range
+                if is_recent_date_string(date_str, flexible_days):
+                    # Also check if dates roughly match (if article has a date)
+                    date_match = check_date_match(article_date, date_str, tolerance_days=3)
+                    if date_match["matches"]:
+                        return {"verified_url": canonicalize(result_url or ""), "verified_date": date_str, "date_verification": "exact_match"}
+                    elif date_match["close_match"]:
+                        # Accept close matches but note the discrepancy
+                        return {
+                            "verified_url": canonicalize(result_url or ""),
+                            "verified_date": date_str,
+                            "date_verification": f"close_match (claimed: {article_date}, actual: {date_str})",
+                        }
+    return None
+
+
+def _match_organic_result(article: Dict[str, Any], organic_results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """First organic result whose title or snippet matches the article, as verification fields."""
+    title = article.get("title", "")
+    for result in organic_results:
+        result_title = result.get("title", "").lower()
+        result_url = result.get("link")
+        snippet = result.get("snippet", "").lower()
+        
+        if (title.lower() in result_title or 
+            title.lower() in snippet or
+            len(set(title.lower().split()) & set(result_title.split())) >= 3):  # Just 3 words match is enough
+            # Note we can't verify date from regular search
+            return {"verified_url": canonicalize(result_url or ""), "date_verification": "google_search_no_date"}
+    return None
+
+
+def search_article(article: Dict[str, Any], days_back: int = 3) -> Dict[str, Any]:
+    """
+    Single SerpAPI lookup for an article, shared by URL fixing and verification.
+    Queries Google News first and only falls back to organic web results when no
+    news result matches. Memoized per run, so later stages reuse it for free.
+    Returns {'news_results', 'organic_results', 'flexible_days', 'error'}.
+    """
+    from config import SERPAPI_KEY
+
+    # Search for the article - start without quotes for better flexibility
+    query = f"{article.get('title', '')} {article.get('source', '')}"
+    flexible_days = _search_window_days(days_back)
+    key = (" ".join(query.lower().split()), flexible_days)
+
+    with _memo_lock:
+        if key in _article_search_memo:
+            return _article_search_memo[key]
+        key_lock = _article_search_locks.setdefault(key, threading.Lock())
+
+    # Concurrent callers for the same article wait for the first lookup instead of repeating it
+    with key_lock:
+        with _memo_lock:
+            if key in _article_search_memo:
+                return _article_search_memo[key]
+
+        found: Dict[str, Any] = {"news_results": [], "organic_results": [], "flexible_days": flexible_days, "error": None}
+        try:
+            # First try Google News
+            data = serpapi_search({
+                "engine": "google_news",
+                "q": query,
+                "hl": "en",
+                "gl": "us",
+                "num": 20,
+                "api_key": SERPAPI_KEY,
+                "tbs": f"qdr:d{flexible_days}"  # Use flexible date range
+            })
+            if data:
+                found["news_results"] = data.get("news_results") or []
+
+            # Try regular Google search as fallback
+            if not _match_news_result(article, found["news_results"], flexible_days):
+                data = serpapi_search({
+                    "engine": "google",
+                    "q": query,
+                    "hl": "en",
+                    "gl": "us",
+                    "num": 10,
+                    "api_key": SERPAPI_KEY,
+                    "tbs": f"qdr:d{flexible_days}"
+                })
+                if data:
+                    found["organic_results"] = data.get("organic_results") or []
+        except Exception as e:
+            found["error"] = str(e)
+            # Errors are not memoized so a later stage can retry
+            return found
+
+        with _memo_lock:
+            _article_search_memo[key] = found
+        return found
+
+
 def verify_article_with_search(article: Dict[str, Any], days_back: int = 3) -> Dict[str, Any]:
     """
     Verify an article exists by searching for it on the web.
     Returns the article with verification status and corrected URL if found.
     Also checks if the article date matches (within acceptable range).
     """
-    import requests
     from config import SERPAPI_KEY
     
     if not SERPAPI_KEY:
@@ -238,114 +467,56 @@ def verify_article_with_search(article: Dict[str, Any], days_back: int = 3) -> D
         article["verification_reason"] = "No SERP API key"
         return article
     
-    # Build search query from title and source
-    title = article.get("title", "")
-    source = article.get("source", "")
-    article_date = article.get("date", "")
-    
-    if not title:
+    if not article.get("title", ""):
         article["verified"] = False
         article["verification_reason"] = "No title to search"
         return article
     
-    # Search for the article - start without quotes for better flexibility
-    query = f"{title} {source}"
-    
-    # Flexible date tolerance: if looking for 3 days, allow up to 7 days
-    flexible_days = max(days_back * 2, 7)
-    
-    try:
-        # First try Google News
-        params = {
-            "engine": "google_news",
-            "q": query,
-            "hl": "en",
-            "gl": "us",
-            "num": 20,
-            "api_key": SERPAPI_KEY,
-            "tbs": f"qdr:d{flexible_days}"  # Use flexible date range
-        }
-        
-        r = requests.get("https://serpapi.com/search", params=params, timeout=30)
-        if r.ok:
-            data = r.json()
-            news_results = data.get("news_results", [])
-            
-            # Look for exact or close match
-            for result in news_results:
-                result_title = result.get("title", "").lower()
-                # result_source = result.get("source", {}).get("name", "").lower() # Not used currently
-                result_url = result.get("link")
-                date_str = result.get("date")
-                
-                # Check title similarity
-                if (title.lower() in result_title or 
-                    result_title in title.lower() or
-                    # Check if most words match
-                    len(set(title.lower().split()) & set(result_title.split())) > min(3, len(title.split()) // 2)):
-                    
-                    # Verify date is recent and matches claimed date
-                    if date_str:
-                        # Check if the found article is within flexible date range
-                        if is_recent_date_string(date_str, flexible_days):
-                            # Also check if dates roughly match (if article has a date)
-                            date_match = check_date_match(article_date, date_str, tolerance_days=3)
-                            if date_match["matches"]:
-                                article["verified"] = True
-                                article["verified_url"] = result_url
-                                article["verified_date"] = date_str
-                                article["original_url"] = article.get("url", "")
-                                article["date_verification"] = "exact_match"
-                                return article
-                            elif date_match["close_match"]:
-                                # Accept close matches but note the discrepancy
-                                article["verified"] = True
-                                article["verified_url"] = result_url
-                                article["verified_date"] = date_str
-                                article["original_url"] = article.get("url", "")
-                                article["date_verification"] = f"close_match (claimed: {article_date}, actual: {date_str})"
-                                return article
-        
-        # Try regular Google search as fallback
-        params = {
-            "engine": "google",
-            "q": query,
-            "hl": "en",
-            "gl": "us",
-            "num": 10,
-            "api_key": SERPAPI_KEY,
-            "tbs": f"qdr:d{flexible_days}"
-        }
-        
-        r = requests.get("https://serpapi.com/search", params=params, timeout=30)
-        if r.ok:
-            data = r.json()
-            organic_results = data.get("organic_results", [])
-            
-            for result in organic_results:
-                result_title = result.get("title", "").lower()
-                result_url = result.get("link")
-                snippet = result.get("snippet", "").lower()
-                
-                if (title.lower() in result_title or 
-                    title.lower() in snippet or
-                    len(set(title.lower().split()) & set(result_title.split())) >= 3):  # Just 3 words match is enough
-                    
-                    article["verified"] = True
-                    article["verified_url"] = result_url
-                    article["original_url"] = article.get("url", "")
-                    article["date_verification"] = "google_search_no_date"  # Note we can't verify date from regular search
-                    return article
-        
-        # Not found
+    found = search_article(article, days_back)
+    if found["error"]:
         article["verified"] = False
-        article["verification_reason"] = "Article not found in search results"
+        article["verification_reason"] = f"Search error: {found['error']}"
         return article
-        
-    except Exception as e:
-        article["verified"] = False
-        article["verification_reason"] = f"Search error: {str(e)}"
+
+    match = (_match_news_result(article, found["news_results"], found["flexible_days"])
+             or _match_organic_result(article, found["organic_results"]))
+    if match:
+        article["verified"] = True
+        article["original_url"] = article.get("url", "")
+        article.update(match)
         return article
+    
+    # Not found
+    article["verified"] = False
+    article["verification_reason"] = "Article not found in search results"
+    return article
+
+
+def absolute_search_date(date_str: str, now: Optional[datetime] = None) -> Optional[str]:
+    """
+    A search result date ('3 hours ago', '2 days ago', 'Oct 15, 2026') as YYYY-MM-DD,
+    resolved against now; None if it can't be parsed.
+    """
+    now = now or datetime.now()
+    lower_date = (date_str or "").lower().strip()
+    if not lower_date:
+        return None
+    try:
+        if "hour" in lower_date or "minute" in lower_date or "today" in lower_date:
+            return now.strftime("%Y-%m-%d")
+        if "yesterday" in lower_date:
+            return (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        if "ago" in lower_date:
+            import re
+            match = re.search(r'(\d+)\s*(day|week)', lower_date)
+            if not match:
+                return None
+            days_ago = int(match.group(1)) * (7 if match.group(2) == "week" else 1)
+            return (now - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+        from dateutil import parser
+        return parser.parse(date_str).strftime("%Y-%m-%d")
+    except (ValueError, OverflowError):
+        return None
 
 
 def is_recent_date_string(date_str: str, days: int) -> bool:
@@ -426,35 +597,70 @@ def check_date_match(claimed_date: str, actual_date: str, tolerance_days: int =
         return {"matches": True, "close_match": True}
 
 
-def check_articles_for_hallucinations(articles: List[Dict[str, Any]], section: str, days_back: int = 3) -> List[Dict[str, Any]]:
+def check_articles_for_hallucinations(articles: List[Dict[str, Any]], section: str, days_back: int = 3, max_workers: int = VERIFY_MAX_WORKERS, run_date: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Check a list of articles for hallucinations by verifying them with web search.
     Returns only verified articles with corrected URLs.
+    Articles are verified concurrently (up to max_workers); output keeps input order.
+    Outcomes reused by annotate_seen_stories skip the search; fresh ones are
+    recorded in the seen-story index under run_date (default today).
     """
     if not articles:
         return []
     
     print(f"\n🔍 Checking {len(articles)} articles for hallucinations in '{section}'...", flush=True)
-    
+
+    def _verify(idx: int, article: Dict[str, Any]):
+        def _task():
+            if article.get("verification_reused_from"):
+                return article
+            print(f"   Verifying {idx}/{len(articles)}: {article.get('title', '')[:60]}...", flush=True)
+            return verify_article_with_search(article, days_back)
+        return _task
+
+    started = time.perf_counter()
+    results = run_bounded(
+        [(idx, _verify(idx, article)) for idx, article in enumerate(articles, 1)],
+        max_workers=max_workers,
+    )
+
     verified_articles = []
-    for idx, article in enumerate(articles, 1):
-        print(f"   Verifying {idx}/{len(articles)}: {article.get('title', '')[:60]}...", flush=True)
-        verified_article = verify_article_with_search(article, days_back)
-        
+    slowest = 0.0
+    for res in results:
+        verified_article = res["value"]
+        slowest = max(slowest, res["elapsed"])
+        if verified_article is None:
+            continue
         if verified_article.get("verified"):
             # Use the verified URL if found
             if verified_article.get("verified_url"):
                 verified_article["url"] = verified_article["verified_url"]
             verified_articles.append(verified_article)
-            print(f"      ✅ Verified: {verified_article.get('source', '')}", flush=True)
+            if verified_article.get("verification_reused_from"):
+                print(f"   {res['key']}. ♻️ Verified on {verified_article['verification_reused_from']}: {verified_article.get('source', '')}", flush=True)
+                continue
+            print(f"   {res['key']}. ✅ Verified ({res['elapsed']:.1f}s): {verified_article.get('source', '')}", flush=True)
             if verified_article.get("date_verification"):
                 print(f"      📅 Date: {verified_article.get('date_verification', '')}", flush=True)
             if verified_article.get("verified_url") != verified_article.get("original_url"):
                 print(f"      🔗 Updated URL: {verified_article['verified_url']}", flush=True)
         else:
-            print(f"      ❌ Not verified: {verified_article.get('verification_reason', 'Unknown')}", flush=True)
+            print(f"   {res['key']}. ❌ Not verified ({res['elapsed']:.1f}s): {verified_article.get('verification_reason', 'Unknown')}", flush=True)
     
-    print(f"   📊 Verified {len(verified_articles)}/{len(articles)} articles", flush=True)
+    print(f"   📊 Verified {len(verified_articles)}/{len(articles)} articles in {time.perf_counter() - started:.1f}s (slowest {slowest:.1f}s)", flush=True)
+
+    # Search errors are transient, so only definite outcomes go into the index
+    fresh = [r["value"] for r in results if r["value"] is not None
+             and not r["value"].get("verification_reused_from")
+             and not str(r["value"].get("verification_reason", "")).startswith(("Search error", "No SERP API key"))]
+    # Relative result dates ("2 days ago") would be wrong by the time a later run reads them
+    for article in fresh:
+        if article.get("verified_date"):
+            article["verified_date"] = absolute_search_date(article["verified_date"]) or ""
+    try:
+        record_story_verifications(run_date or datetime.now().strftime("%Y-%m-%d"), fresh)
+    except Exception as e:
+        print(f"   ⚠️ Could not record verification outcomes: {e}", flush=True)
     return verified_articles
 
 
@@ -463,7 +669,6 @@ def google_search_first_result(query: str) -> Optional[str]:
     Resolve first search result link using SerpAPI. Falls back to HTML scrape if needed.
     """
     try:
-        import requests
         import os
         from urllib.parse import quote, unquote
         from config import SERPAPI_KEY
@@ -478,9 +683,8 @@ def google_search_first_result(query: str) -> Optional[str]:
                 "num": 10,
                 "api_key": SERPAPI_KEY,
             }
-            r = requests.get("https://serpapi.com/search", params=params_news, timeout=30)
-            if r.ok:
-                data = r.json()
+            data = serpapi_search(params_news)
+            if data:
                 news_results = data.get("news_results") or []
                 for item in news_results:
                     url = item.get("link") or item.get("source_url")
@@ -496,9 +700,8 @@ def google_search_first_result(query: str) -> Optional[str]:
                 "num": 10,
                 "api_key": SERPAPI_KEY,
             }
-            r2 = requests.get("https://serpapi.com/search", params=params_org, timeout=30)
-            if r2.ok:
-                data2 = r2.json()
+            data2 = serpapi_search(params_org)
+            if data2:
                 organic = data2.get("organic_results") or []
                 if organic:
                     link = organic[0].get("link")
@@ -510,7 +713,6 @@ def google_search_first_result(query: str) -> Optional[str]:
     
     # Final fallback: existing HTML parsing approach
     try:
-        import requests
         from urllib.parse import quote, unquote
         import re
         import html as ihtml
@@ -525,7 +727,7 @@ def google_search_first_result(query: str) -> Optional[str]:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
         }
-        response = requests.get(search_url, headers=headers, timeout=30)
+        response = http_client.get(search_url, headers=headers)
         response.raise_for_status()
         html_text = ihtml.unescape(response.text)
         pattern_redirect_rel = r'href="/url\?q=([^"&]+)(?:&|&amp;)'  # relative
@@ -553,23 +755,40 @@ def google_search_first_result(query: str) -> Optional[str]:
         return None
 
 
+def _resolve_article_url(article: Dict[str, Any], days_back: int = 3) -> Optional[str]:
+    """
+    Pick a canonical URL for an article. When its shared (date-restricted)
+    search_article lookup has a matching result, that result's URL is used and
+    the verification pass gets it for free. Otherwise URL fixing keeps its
+    original behaviour: the first result of an undated search, so older
+    articles still resolve.
+    """
+    from config import SERPAPI_KEY
+
+    if SERPAPI_KEY and article.get("title"):
+        found = search_article(article, days_back)
+        if not found["error"]:
+            match = (_match_news_result(article, found["news_results"], found["flexible_days"])
+                     or _match_organic_result(article, found["organic_results"]))
+            if match and match.get("verified_url"):
+                return match["verified_url"]
+
+    return google_search_first_result(f"{article.get('title', '')} - {article.get('source', '')}")
+
+
 def fix_article_urls_with_search(articles: List[Dict[str, Any]], llm_name: str) -> List[Dict[str, Any]]:
     """
     For each article, search Google for the title and replace URL with first result.
+    The lookup is memoized, so the later verification pass reuses it.
     """
     print(f"   🔍 Searching Google for {llm_name} article URLs...", flush=True)
     
     fixed_articles = []
     for idx, article in enumerate(articles, 1):
         title = article.get('title', '')
-        source = article.get('source', '')
         original_url = article.get('url', '')
         
-        # Construct search query
-        search_query = f"{title} - {source}"
-        
-        # Get first Google result
-        found_url = google_search_first_result(search_query)
+        found_url = _resolve_article_url(article)
         
         if found_url:
             fixed_article = article.copy()
@@ -593,203 +812,325 @@ def fix_article_urls_with_search(articles: List[Dict[str, Any]], llm_name: str)
     return fixed_articles
 
 
-def fetch_llm_news_for_section(
+def _fetch_openai_news(
     prompt: List[Dict[str, str]],
-    llm_enabled: Dict[str, bool],
     llm_config: Dict[str, Any],
     clients: Dict[str, Any]
 ) -> List[Dict[str, Any]]:
     collected: List[Dict[str, Any]] = []
 
     # OpenAI -> object with articles array; handle deep-research prompt variant
-    if llm_enabled.get("openai") and clients.get("openai"):
-        try:
-            is_deep_research = "deep-research" in llm_config["openai_model"].lower()
-            print(f"\n   📝 OpenAI Prompt:", flush=True)
-            for msg in prompt:
-                print(f"      [{msg['role'].upper()}]:", flush=True)
-                print(f"      {msg['content']}", flush=True)
-                print(f"      " + "-"*80, flush=True)
-            if is_deep_research:
-                modified_prompt = list(prompt)
-                modified = dict(modified_prompt[-1])
-                modified["content"] += (
-                    "\n\nIMPORTANT: Return your response as a valid JSON object with the following structure:\n"
-                    "{\n"
-                    '  "articles": [\n'
-                    "    {\n"
-                    '      "title": "Article title",\n'
-                    '      "summary": "2-4 sentence summary",\n'
-                    '      "source": "Publication or website name",\n'
-                    '      "url": "https://...",\n'
-                    '      "date": "YYYY-MM-DD"\n'
-                    "    },\n"
-                    "    ... (repeat for all articles)\n"
-                    "  ]\n"
-                    "}\n\n"
-                    "Ensure the response is valid JSON that can be parsed."
-                )
-                modified_prompt[-1] = modified
-                print(f"\n   📝 OpenAI Deep-Research Modified User Prompt:", flush=True)
-                print(f"      {modified['content']}", flush=True)
-                print(f"      " + "-"*80, flush=True)
-                data = call_openai(
-                    client=clients["openai"],
-                    messages=modified_prompt,
-                    model=llm_config["openai_model"],
-                    tools=[{"type": "web_search_preview"}],
-                    json_schema=None,
-                )
-                if llm_config.get("test_mode"):
-                    print(f"🔍 FINAL OUTPUT: {data}", flush=True)
-                articles = data.get("articles", []) if isinstance(data, dict) else []
-            else:
-                schema_obj = format_json_schema({
-                    "type": "object",
-                    "properties": {
-                        "articles": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "title": {"type": "string"},
-                                    "summary": {"type": "string"},
-                                    "source": {"type": "string"},
-                                    "url": {"type": "string"},
-                                    "date": {"type": "string"}
-                                },
-                                "required": ["title", "summary", "source", "url", "date"],
-                                "additionalProperties": False
-                            }
-                        }
-                    },
-                    "required": ["articles"],
-                    "additionalProperties": False
-                }, name="ai_news_response")
-                data = call_openai(
-                    client=clients["openai"],
-                    messages=prompt,
-                    model=llm_config["openai_model"],
-                    tools=[{"type": "web_search_preview"}],
-                    json_schema=schema_obj,
-                )
-                articles = data.get("articles", []) if isinstance(data, dict) else []
-            for a in articles:
-                a["client"] = "OpenAI"
-            
-            # Fix URLs with Google search before adding to collected
-            articles = fix_article_urls_with_search(articles, "OpenAI")
-            
-            collected.extend(articles)
-            print(f"   ✅ OpenAI ({llm_config['openai_model']}): {len(articles)} articles", flush=True)
-            for idx, article in enumerate(articles, 1):
-                print(f"      {idx}. {article.get('title', '')[:80]}...", flush=True)
-                print(f"         Source: {article.get('source', '')} | Date: {article.get('date', '')}", flush=True)
-                print(f"         URL: {article.get('url', '')}", flush=True)
-        except Exception as e:
-            print(f"   ❌ OpenAI ({llm_config['openai_model']}): ERROR - {str(e)}", flush=True)
+    try:
+        is_deep_research = "deep-research" in llm_config["openai_model"].lower()
+        print(f"\n   📝 OpenAI Prompt:", flush=True)
+        for msg in prompt:
+            print(f"      [{msg['role'].upper()}]:", flush=True)
+            print(f"      {msg['content']}", flush=True)
+            print(f"      " + "-"*80, flush=True)
+        if is_deep_research:
+            modified_prompt = list(prompt)
+            modified = dict(modified_prompt[-1])
+            modified["content"] += (
+                "\n\nIMPORTANT: Return your response as a valid JSON object with the following structure:\n"
+                "{\n"
+                '  "articles": [\n'
+                "    {\n"
+                '      "title": "Article title",\n'
+                '      "summary": "2-4 sentence summary",\n'
+                '      "source": "Publication or website name",\n'
+                '      "url": "https://...",\n'
+                '      "date": "YYYY-MM-DD"\n'
+                "    },\n"
+                "    ... (repeat for all articles)\n"
+                "  ]\n"
+                "}\n\n"
+                "Ensure the response is valid JSON that can be parsed."
+            )
+            modified_prompt[-1] = modified
+            print(f"\n   📝 OpenAI Deep-Research Modified User Prompt:", flush=True)
+            print(f"      {modified['content']}", flush=True)
+            print(f"      " + "-"*80, flush=True)
+            data = call_openai(
+                client=clients["openai"],
+                messages=modified_prompt,
+                model=llm_config["openai_model"],
+                tools=[{"type": "web_search_preview"}],
+                json_schema=None,
+                cache_ttl=LLM_CACHE_TTLS["news_search"],
+            )
             if llm_config.get("test_mode"):
-                import traceback
-                traceback.print_exc()
+                print(f"🔍 FINAL OUTPUT: {data}", flush=True)
+            articles = data.get("articles", []) if isinstance(data, dict) else []
+        else:
+            schema_obj = format_json_schema({
+                "type": "object",
+                "properties": {
+                    "articles": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "title": {"type": "string"},
+                                "summary": {"type": "string"},
+                                "source": {"type": "string"},
+                                "url": {"type": "string"},
+                                "date": {"type": "string"}
+                            },
+                            "required": ["title", "summary", "source", "url", "date"],
+                            "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["articles"],
+                "additionalProperties": False
+            }, name="ai_news_response")
+            data = call_openai(
+                client=clients["openai"],
+                messages=prompt,
+                model=llm_config["openai_model"],
+                tools=[{"type": "web_search_preview"}],
+                json_schema=schema_obj,
+                cache_ttl=LLM_CACHE_TTLS["news_search"],
+            )
+            articles = data.get("articles", []) if isinstance(data, dict) else []
+        for a in articles:
+            a["client"] = "OpenAI"
+        
+        # Fix URLs with Google search before adding to collected
+        articles = fix_article_urls_with_search(articles, "OpenAI")
+        
+        collected.extend(articles)
+        print(f"   ✅ OpenAI ({llm_config['openai_model']}): {len(articles)} articles", flush=True)
+        for idx, article in enumerate(articles, 1):
+            print(f"      {idx}. {article.get('title', '')[:80]}...", flush=True)
+            print(f"         Source: {article.get('source', '')} | Date: {article.get('date', '')}", flush=True)
+            print(f"         URL: {article.get('url', '')}", flush=True)
+    except Exception as e:
+        print(f"   ❌ OpenAI ({llm_config['openai_model']}): ERROR - {str(e)}", flush=True)
+        if llm_config.get("test_mode"):
+            import traceback
+            traceback.print_exc()
+        # Re-raised so the fan-out can tell a failed provider from an empty answer
+        raise
+
+    return collected
+
+
+def _fetch_perplexity_news(
+    prompt: List[Dict[str, str]],
+    llm_config: Dict[str, Any],
+    clients: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    collected: List[Dict[str, Any]] = []
 
     # Perplexity -> top-level array
-    if llm_enabled.get("perplexity") and llm_config.get("perplexity_api_key"):
-        try:
-            print(f"\n   📝 Perplexity Prompt:", flush=True)
-            for msg in prompt:
-                print(f"      [{msg['role'].upper()}]:", flush=True)
-                print(f"      {msg['content']}", flush=True)
-                print(f"      " + "-"*80, flush=True)
-            schema_arr = format_json_schema({
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string"},
-                        "summary": {"type": "string"},
-                        "source": {"type": "string"},
-                        "url": {"type": "string"},
-                        "date": {"type": "string"}
-                    },
-                    "required": ["title", "summary", "source", "url", "date"]
-                }
-            }, name="ai_news_list")
-            items = call_perplexity(
-                api_key=llm_config["perplexity_api_key"],
-                messages=prompt,
-                model=llm_config["perplexity_model"],
-                json_schema=schema_arr,
-                timeout=30
+    try:
+        print(f"\n   📝 Perplexity Prompt:", flush=True)
+        for msg in prompt:
+            print(f"      [{msg['role'].upper()}]:", flush=True)
+            print(f"      {msg['content']}", flush=True)
+            print(f"      " + "-"*80, flush=True)
+        schema_arr = format_json_schema({
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "summary": {"type": "string"},
+                    "source": {"type": "string"},
+                    "url": {"type": "string"},
+                    "date": {"type": "string"}
+                },
+                "required": ["title", "summary", "source", "url", "date"]
+            }
+        }, name="ai_news_list")
+        items = call_perplexity(
+            api_key=llm_config["perplexity_api_key"],
+            messages=prompt,
+            model=llm_config["perplexity_model"],
+            json_schema=schema_arr,
+            timeout=30,
+            cache_ttl=LLM_CACHE_TTLS["news_search"],
+        )
+        for a in items or []:
+            a["client"] = "Perplexity"
+        
+        # Fix URLs with Google search before adding to collected
+        if items:
+            items = fix_article_urls_with_search(items, "Perplexity")
+        
+        collected.extend(items or [])
+        print(f"   ✅ Perplexity ({llm_config['perplexity_model']}): {len(items or [])} articles", flush=True)
+        for idx, article in enumerate(items if items else [], 1):
+            print(f"      {idx}. {article.get('title', '')[:80]}...", flush=True)
+            print(f"         Source: {article.get('source', '')} | Date: {article.get('date', '')}", flush=True)
+            print(f"         URL: {article.get('url', '')}", flush=True)
+    except Exception as e:
+        print(f"   ❌ Perplexity ({llm_config['perplexity_model']}): ERROR - {str(e)}", flush=True)
+        if llm_config.get("test_mode"):
+            import traceback
+            traceback.print_exc()
+        # Re-raised so the fan-out can tell a failed provider from an empty answer
+        raise
+
+    return collected
+
+
+def _fetch_gemini_news(
+    prompt: List[Dict[str, str]],
+    llm_config: Dict[str, Any],
+    clients: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    collected: List[Dict[str, Any]] = []
+
+    # Gemini -> array via JSON instruction; adjust to EXACTLY 10 and no wrapping
+    try:
+        print(f"\n   📝 Gemini Prompt (before modification):", flush=True)
+        for msg in prompt:
+            print(f"      [{msg['role'].upper()}]:", flush=True)
+            print(f"      {msg['content']}", flush=True)
+            print(f"      " + "-"*80, flush=True)
+        # Copy the messages so the shared section prompt isn't mutated for other providers
+        modified_prompt = [dict(msg) for msg in prompt]
+        if len(modified_prompt) > 1 and "content" in modified_prompt[1]:
+            modified_prompt[1]["content"] = modified_prompt[1]["content"].replace(
+                "exactly 5",
+                "exactly 10"
             )
-            for a in items or []:
-                a["client"] = "Perplexity"
+        json_instruction = (
+            "\n\nRespond ONLY with a raw JSON array of objects. "
+            "DO NOT wrap the array in a dictionary like {\"articles\": [...]}. "
+            "DO NOT include markdown formatting such as ```json. "
+            "Each object MUST contain exactly these keys: 'title', 'summary', 'source', 'url', 'date'. "
+            "Remember to return EXACTLY 10 articles, not 5. "
+            "Ensure it is valid JSON and parsable by Python's json.loads()."
+        )
+        print(f"\n   📝 Gemini Modified User Prompt (with JSON instruction):", flush=True)
+        print(f"      {modified_prompt[1]['content'] + json_instruction}", flush=True)
+        print(f"      " + "-"*80, flush=True)
+        parsed = call_gemini(
+            client=clients["gemini"],
+            messages=modified_prompt,
+            model=llm_config["gemini_model"],
+            json_instruction=json_instruction,
+            cache_ttl=LLM_CACHE_TTLS["news_search"],
+        )
+        if isinstance(parsed, dict) and "articles" in parsed:
+            parsed = parsed["articles"]
+        if isinstance(parsed, list):
+            for a in parsed:
+                a["client"] = "Gemini"
             
             # Fix URLs with Google search before adding to collected
-            if items:
-                items = fix_article_urls_with_search(items, "Perplexity")
+            parsed = fix_article_urls_with_search(parsed, "Gemini")
             
-            collected.extend(items or [])
-            print(f"   ✅ Perplexity ({llm_config['perplexity_model']}): {len(items or [])} articles", flush=True)
-            for idx, article in enumerate(items if items else [], 1):
+            collected.extend(parsed)
+            print(f"   ✅ Gemini ({llm_config['gemini_model']}): {len(parsed)} articles", flush=True)
+            for idx, article in enumerate(parsed, 1):
                 print(f"      {idx}. {article.get('title', '')[:80]}...", flush=True)
                 print(f"         Source: {article.get('source', '')} | Date: {article.get('date', '')}", flush=True)
                 print(f"         URL: {article.get('url', '')}", flush=True)
-        except Exception as e:
-            print(f"   ❌ Perplexity ({llm_config['perplexity_model']}): ERROR - {str(e)}", flush=True)
-            if llm_config.get("test_mode"):
-                import traceback
-                traceback.print_exc()
+    except Exception as e:
+        print(f"   ❌ Gemini ({llm_config['gemini_model']}): ERROR - {str(e)}", flush=True)
+        if llm_config.get("test_mode"):
+            import traceback
+            traceback.print_exc()
+        # Re-raised so the fan-out can tell a failed provider from an empty answer
+        raise
 
-    # Gemini -> array via JSON instruction; adjust to EXACTLY 10 and no wrapping
-    if llm_enabled.get("gemini") and clients.get("gemini"):
-        try:
-            print(f"\n   📝 Gemini Prompt (before modification):", flush=True)
-            for msg in prompt:
-                print(f"      [{msg['role'].upper()}]:", flush=True)
-                print(f"      {msg['content']}", flush=True)
-                print(f"      " + "-"*80, flush=True)
-            modified_prompt = list(prompt)
-            if len(modified_prompt) > 1 and "content" in modified_prompt[1]:
-                modified_prompt[1]["content"] = modified_prompt[1]["content"].replace(
-                    "exactly 5",
-                    "exactly 10"
-                )
-            json_instruction = (
-                "\n\nRespond ONLY with a raw JSON array of objects. "
-                "DO NOT wrap the array in a dictionary like {\"articles\": [...]}. "
-                "DO NOT include markdown formatting such as ```json. "
-                "Each object MUST contain exactly these keys: 'title', 'summary', 'source', 'url', 'date'. "
-                "Remember to return EXACTLY 10 articles, not 5. "
-                "Ensure it is valid JSON and parsable by Python's json.loads()."
-            )
-            print(f"\n   📝 Gemini Modified User Prompt (with JSON instruction):", flush=True)
-            print(f"      {modified_prompt[1]['content'] + json_instruction}", flush=True)
-            print(f"      " + "-"*80, flush=True)
-            parsed = call_gemini(
-                client=clients["gemini"],
-                messages=modified_prompt,
-                model=llm_config["gemini_model"],
-                json_instruction=json_instruction
-            )
-            if isinstance(parsed, dict) and "articles" in parsed:
-                parsed = parsed["articles"]
-            if isinstance(parsed, list):
-                for a in parsed:
-                    a["client"] = "Gemini"
-                
-                # Fix URLs with Google search before adding to collected
-                parsed = fix_article_urls_with_search(parsed, "Gemini")
-                
-                collected.extend(parsed)
-                print(f"   ✅ Gemini ({llm_config['gemini_model']}): {len(parsed)} articles", flush=True)
-                for idx, article in enumerate(parsed, 1):
-                    print(f"      {idx}. {article.get('title', '')[:80]}...", flush=True)
-                    print(f"         Source: {article.get('source', '')} | Date: {article.get('date', '')}", flush=True)
-                    print(f"         URL: {article.get('url', '')}", flush=True)
-        except Exception as e:
-            print(f"   ❌ Gemini ({llm_config['gemini_model']}): ERROR - {str(e)}", flush=True)
-            if llm_config.get("test_mode"):
-                import traceback
-                traceback.print_exc()
+    return collected
 
-    return collected
\ No newline at end of file
+
+# Provider order matches the original sequential pipeline
+_LLM_NEWS_FETCHERS = [
+    ("openai", _fetch_openai_news),
+    ("perplexity", _fetch_perplexity_news),
+    ("gemini", _fetch_gemini_news),
+]
+
+
+def _provider_enabled(provider: str, llm_enabled: Dict[str, bool], llm_config: Dict[str, Any], clients: Dict[str, Any]) -> bool:
+    if not llm_enabled.get(provider):
+        return False
+    if provider == "perplexity":
+        return bool(llm_config.get("perplexity_api_key"))
+    return bool(clients.get(provider))
+
+
+def fetch_llm_news_for_section(
+    prompt: List[Dict[str, str]],
+    llm_enabled: Dict[str, bool],
+    llm_config: Dict[str, Any],
+    clients: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    collected: List[Dict[str, Any]] = []
+    for provider, fetcher in _LLM_NEWS_FETCHERS:
+        if _provider_enabled(provider, llm_enabled, llm_config, clients):
+            try:
+                collected.extend(_canonicalize_urls(fetcher(prompt, llm_config, clients)))
+            except Exception:
+                # Already logged by the fetcher; the other providers still count
+                pass
+    return collected
+
+
+def fetch_llm_news_for_sections(
+    prompts: Dict[str, List[Dict[str, str]]],
+    llm_enabled: Dict[str, bool],
+    llm_config: Dict[str, Any],
+    clients: Dict[str, Any],
+    max_workers: int = NEWS_FANOUT_WORKERS,
+    on_section: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fan out every (section, provider) pair concurrently.
+    Per-provider caps are enforced in llm_core; results are merged in section
+    order, then provider order (OpenAI, Perplexity, Gemini), exactly like the
+    sequential loop. on_section(section, articles) fires once all of a
+    section's providers have finished without error; a section with a failed
+    provider is still returned (with whatever the others found) but on_section
+    is skipped, so a checkpointed run retries it on resume.
+    """
+    tasks = []
+    for section, prompt in prompts.items():
+        for provider, fetcher in _LLM_NEWS_FETCHERS:
+            if not _provider_enabled(provider, llm_enabled, llm_config, clients):
+                continue
+
+            def _task(section=section, provider=provider, prompt=prompt, fetcher=fetcher):
+                print(f"\n🔍 Fetching {section} ({provider}):", flush=True)
+                return _canonicalize_urls(fetcher(prompt, llm_config, clients))
+
+            tasks.append(((section, provider), _task))
+
+    collected: Dict[str, List[Dict[str, Any]]] = {section: [] for section in prompts}
+    failed: Dict[str, List[str]] = {section: [] for section in prompts}
+    pending = {section: 0 for section in prompts}
+    for (section, _), _ in tasks:
+        pending[section] += 1
+
+    # Results arrive in submission order, so each section's articles stay in provider order
+    def _collect(res: Dict[str, Any]) -> None:
+        section, provider = res["key"]
+        collected[section].extend(res["value"] or [])
+        if res["error"] is not None:
+            failed[section].append(provider)
+        print(f"   ⏱️  {section} / {provider}: {res['elapsed']:.1f}s", flush=True)
+        pending[section] -= 1
+        if pending[section] > 0:
+            return
+        if failed[section]:
+            print(f"   ⚠️ {section}: {', '.join(failed[section])} failed; section left incomplete", flush=True)
+        elif on_section is not None:
+            on_section(section, collected[section])
+
+    # Sections with every provider disabled are complete (and empty) up front
+    if on_section is not None:
+        for section, count in pending.items():
+            if count == 0:
+                on_section(section, collected[section])
+
+    started = time.perf_counter()
+    run_bounded(tasks, max_workers=max_workers, on_result=_collect)
+    print(f"\n⏱️  LLM fan-out: {len(tasks)} calls in {time.perf_counter() - started:.1f}s", flush=True)
+    return collected
@@ -0,0 +1,100 @@
+"""
+In-process LRU cache of rendered digest page bodies.
+
+A digest never changes after save_digest, so its rendered HTML is cached under
+(kind, date, version), where version is the digest's created_at. Saved/unsaved
+button labels are the only per-request state: bodies are rendered with a slot
+marker in place of each label and split once, so a cached body is served by
+filling the slots from one saved_urls_among() lookup.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+# Rendered in place of every Save/Unsave label; content passes through strip_nul
+# first, so the only NULs in a rendered body are the slot markers
+SAVE_LABEL_SLOT = "\x00saved-label\x00"
+
+
+def strip_nul(value: Any) -> Any:
+    """Copy of value (str, or lists/dicts of them) with NUL characters removed."""
+    if isinstance(value, str):
+        return value.replace("\x00", "")
+    if isinstance(value, list):
+        return [strip_nul(v) for v in value]
+    if isinstance(value, dict):
+        return {k: strip_nul(v) for k, v in value.items()}
+    return value
+
+
+class RenderedBody:
+    """A rendered body split at its save-label slots, plus the article url behind each slot."""
+
+    __slots__ = ("pieces", "urls")
+
+    def __init__(self, html: str, urls: List[str]):
+        self.pieces = html.split(SAVE_LABEL_SLOT)
+        if len(self.pieces) != len(urls) + 1:
+            raise ValueError(f"{len(self.pieces) - 1} label slots for {len(urls)} articles")
+        self.urls = urls
+
+    def render(self, saved_urls: Set[str]) -> str:
+        out = [self.pieces[0]]
+        for url, piece in zip(self.urls, self.pieces[1:]):
+            out.append('Unsave' if url in saved_urls else 'Save')
+            out.append(piece)
+        return ''.join(out)
+
+
+class PageCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], RenderedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_render(self, key: Tuple[Hashable, ...], render: Callable[[], Optional[RenderedBody]]) -> Optional[RenderedBody]:
+        """Cached body for key, rendering (outside the lock) and storing it on a miss."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return body
+            self._misses += 1
+        body = render()
+        if body is None or self.max_entries <= 0:
+            return body
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def invalidate(self, date_str: str) -> None:
+        """Drop every cached body for a date (keys are (kind, date, version))."""
+        with self._lock:
+            doomed = [k for k in self._entries if len(k) > 1 and k[1] == date_str]
+            for k in doomed:
+                del self._entries[k]
+            self._invalidations += len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'invalidations': self._invalidations,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+            }
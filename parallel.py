@@ -0,0 +1,168 @@
+"""
+Bounded-concurrency helpers for fanning out slow network work.
+
+Tasks run on a thread pool, per-provider semaphores cap how many calls hit each
+LLM API at once, and each task's printed output is captured and replayed in
+submission order so logs stay readable and deterministic.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import io
+import sys
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import LLM_MAX_CONCURRENCY
+
+
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {
+    name: threading.BoundedSemaphore(max(1, limit)) for name, limit in LLM_MAX_CONCURRENCY.items()
+}
+
+
+@contextlib.contextmanager
+def provider_slot(provider: str) -> Iterator[None]:
+    """Hold one of the provider's concurrency slots for the duration of a call."""
+    sem = _provider_semaphores.get(provider)
+    if sem is None:
+        yield
+        return
+    with sem:
+        yield
+
+
+@contextlib.asynccontextmanager
+async def async_provider_slot(provider: str) -> AsyncIterator[None]:
+    """
+    Async counterpart of provider_slot, drawing on the same process-wide semaphores,
+    so threaded and async callers together stay within LLM_MAX_CONCURRENCY. A waiter
+    polls for a free slot instead of parking a thread on the semaphore.
+    """
+    sem = _provider_semaphores.get(provider)
+    if sem is None:
+        yield
+        return
+    delay = 0.005
+    while not sem.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.1)
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+_worker_cleanups: List[Callable[[], None]] = []
+
+
+def on_worker_task_done(fn: Callable[[], None]) -> None:
+    """
+    Call fn() on a run_bounded worker thread after each of its tasks, so modules
+    with thread-local resources (e.g. storage's SQLite connection) can release them.
+    """
+    _worker_cleanups.append(fn)
+
+
+_local = threading.local()
+_install_lock = threading.Lock()
+
+
+class _ThreadRoutedStdout(io.TextIOBase):
+    """stdout proxy that sends writes from capturing threads to their own buffer."""
+
+    def __init__(self, fallback: Any):
+        self._fallback = fallback
+
+    def write(self, s: str) -> int:
+        buf = getattr(_local, "buffer", None)
+        if buf is not None:
+            return buf.write(s)
+        return self._fallback.write(s)
+
+    def flush(self) -> None:
+        if getattr(_local, "buffer", None) is None:
+            self._fallback.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+
+def _install_stdout_router() -> None:
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadRoutedStdout):
+            sys.stdout = _ThreadRoutedStdout(sys.stdout)
+
+
+@contextlib.contextmanager
+def captured_output() -> Iterator[io.StringIO]:
+    """
+    Capture everything printed by the current thread.
+    Unlike contextlib.redirect_stdout this is safe to use from worker threads.
+    """
+    _install_stdout_router()
+    previous = getattr(_local, "buffer", None)
+    buf = io.StringIO()
+    _local.buffer = buf
+    try:
+        yield buf
+    finally:
+        _local.buffer = previous
+
+
+def run_bounded(
+    tasks: Sequence[Tuple[Any, Callable[[], Any]]],
+    max_workers: int,
+    capture_output: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run (key, fn) tasks on at most max_workers threads.
+
+    Returns one dict per task, in input order:
+    {'key', 'value', 'error', 'elapsed', 'log'}.
+    When capture_output is set, each task's output is printed as soon as it and
+    every task before it have finished, so logs come out in submission order.
+    """
+    if not tasks:
+        return []
+
+    def _run(key: Any, fn: Callable[[], Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"key": key, "value": None, "error": None, "elapsed": 0.0, "log": ""}
+        ctx = captured_output() if capture_output else contextlib.nullcontext(None)
+        with ctx as buf:
+            try:
+                result["value"] = fn()
+            except Exception as e:
+                result["error"] = e
+                print(f"   ❌ {key}: {e}", flush=True)
+            finally:
+                for cleanup in _worker_cleanups:
+                    try:
+                        cleanup()
+                    except Exception:
+                        pass
+        result["elapsed"] = time.perf_counter() - started
+        if buf is not None:
+            result["log"] = buf.getvalue()
+        return result
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    next_to_emit = 0
+    workers = max(1, min(max_workers, len(tasks)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(_run, key, fn): idx for idx, (key, fn) in enumerate(tasks)}
+        for fut in concurrent.futures.as_completed(futures):
+            results[futures[fut]] = fut.result()
+            while next_to_emit < len(results) and results[next_to_emit] is not None:
+                res = results[next_to_emit]
+                if res["log"]:
+                    print(res["log"], end="" if res["log"].endswith("\n") else "\n", flush=True)
+                if on_result is not None:
+                    on_result(res)
+                next_to_emit += 1
+
+    return [r for r in results if r is not None]
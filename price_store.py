@@ -0,0 +1,109 @@
+"""
+Persistent daily OHLCV store for tracked tickers (DATA_DIR/prices.db).
+
+Bars are stored split- and dividend-adjusted, one row per ticker and closed
+trading day, so a sync only needs the days after the last stored bar. When Yahoo
+re-adjusts a ticker's history the caller replaces its bars wholesale. Reads return
+pandas frames shaped like yfinance history() (Open/High/Low/Close/Volume, date index).
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config import PRICE_STORE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_bars (
+  ticker TEXT NOT NULL,
+  date TEXT NOT NULL,
+  open REAL,
+  high REAL,
+  low REAL,
+  close REAL,
+  volume REAL,
+  PRIMARY KEY (ticker, date)
+);
+"""
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# Bumped when stored bars become incompatible; version 0 stores held unadjusted bars
+STORE_VERSION = 1
+
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(PRICE_STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(PRICE_STORE_PATH, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL;')
+        conn.executescript(SCHEMA)
+        if conn.execute('PRAGMA user_version').fetchone()[0] < STORE_VERSION:
+            # Dropped bars are downloaded again, adjusted, on the next sync
+            with conn:
+                conn.execute('DELETE FROM daily_bars')
+                conn.execute(f'PRAGMA user_version = {STORE_VERSION}')
+        _local.conn = conn
+    return conn
+
+
+def last_bar_dates(tickers: List[str]) -> Dict[str, str]:
+    """Most recent stored bar date (YYYY-MM-DD) per ticker; tickers with no bars are omitted."""
+    if not tickers:
+        return {}
+    conn = _get_conn()
+    placeholders = ','.join('?' * len(tickers))
+    cur = conn.execute(
+        f'SELECT ticker, MAX(date) FROM daily_bars WHERE ticker IN ({placeholders}) GROUP BY ticker',
+        list(tickers)
+    )
+    return {t: d for t, d in cur.fetchall() if d}
+
+
+def upsert_bars(ticker: str, frame: pd.DataFrame, replace: bool = False) -> int:
+    """
+    Insert or refresh bars from a yfinance frame; returns the number of rows written.
+    With replace=True the ticker's other stored bars are dropped in the same transaction.
+    """
+    rows = []
+    for ts, bar in frame.iterrows():
+        if pd.isna(bar.get("Close")):
+            continue
+        rows.append((
+            ticker, pd.Timestamp(ts).strftime('%Y-%m-%d'),
+            *(None if pd.isna(bar.get(c)) else float(bar.get(c)) for c in COLUMNS),
+        ))
+    if not rows:
+        return 0
+    conn = _get_conn()
+    with conn:
+        if replace:
+            conn.execute('DELETE FROM daily_bars WHERE ticker = ?', (ticker,))
+        conn.executemany(
+            'INSERT OR REPLACE INTO daily_bars (ticker, date, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            rows
+        )
+    return len(rows)
+
+
+def read_bars(ticker: str, since: Optional[str] = None) -> pd.DataFrame:
+    """Stored bars for a ticker from `since` (inclusive) onwards, oldest first."""
+    conn = _get_conn()
+    cur = conn.execute(
+        'SELECT date, open, high, low, close, volume FROM daily_bars WHERE ticker = ? AND date >= ? ORDER BY date',
+        (ticker, since or '')
+    )
+    rows = cur.fetchall()
+    frame = pd.DataFrame([r[1:] for r in rows], columns=COLUMNS, index=pd.DatetimeIndex([r[0] for r in rows], name="Date"))
+    return frame
+
+
+def prune_bars(before: str) -> int:
+    conn = _get_conn()
+    with conn:
+        return conn.execute('DELETE FROM daily_bars WHERE date < ?', (before,)).rowcount
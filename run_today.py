@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """Run today's news collection locally"""
 
+import sys
 from datetime import datetime
 from app import build_digest_for_date
 
 if __name__ == "__main__":
-    print("🚀 Running today's news collection locally...")
+    # --resume picks up from the last run's checkpoints instead of starting over
+    resume = "--resume" in sys.argv[1:]
+    print(f"🚀 Running today's news collection locally{' (resuming)' if resume else ''}...")
     
     today = datetime.now()
-    result = build_digest_for_date(today)
+    result = build_digest_for_date(today, resume=resume)
     
     print(f"\n✅ Done! Collected:")
     for section, articles in result['sections'].items():
@@ -0,0 +1,102 @@
+"""
+Persistent cache for SerpAPI searches.
+
+Results are keyed on the normalized engine and query parameters (the API key is
+never part of the key), so the same headline searched again on a later day is
+served from disk. Searches that come back empty are cached too, for a shorter
+negative TTL, so unfindable headlines don't burn credits on every run.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+import http_client
+from disk_cache import MISSING, make_key, open_cache
+from config import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_MAX_MB,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_NEGATIVE_TTL,
+)
+
+SERPAPI_URL = "https://serpapi.com/search"
+
+# Result lists we care about; a response with none of these is a negative result
+RESULT_KEYS = ("news_results", "organic_results", "top_stories")
+# The one "error" SerpAPI sends for a search that simply found nothing
+_NO_RESULTS_ERROR = "hasn't returned any results"
+# Bulky response metadata that is never read back
+_DROP_KEYS = ("search_metadata", "search_parameters", "search_information", "pagination", "serpapi_pagination")
+
+_search_cache = open_cache(SEARCH_CACHE_PATH, SEARCH_CACHE_MAX_MB)
+_lock = threading.Lock()
+_negative_hits = 0
+_negative_writes = 0
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, str]:
+    """Canonical form of a SerpAPI query: no api_key, lower-cased engine, collapsed whitespace."""
+    norm: Dict[str, str] = {}
+    for name, value in params.items():
+        if name == "api_key" or value is None:
+            continue
+        text = " ".join(str(value).split())
+        if name in ("engine", "hl", "gl"):
+            text = text.lower()
+        norm[name] = text
+    norm.setdefault("engine", "google")
+    return norm
+
+
+class SerpApiError(Exception):
+    """SerpAPI answered 200 with an error body (quota, bad key, ...)."""
+
+
+def _is_empty(data: Dict[str, Any]) -> bool:
+    return not any(data.get(k) for k in RESULT_KEYS)
+
+
+def serpapi_search(params: Dict[str, Any], timeout: Optional[float] = None, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    GET serpapi.com/search through the cache.
+    Returns the parsed response (minus metadata), or None on an HTTP error.
+    HTTP errors are not cached; request exceptions propagate to the caller, as
+    does SerpApiError for a 200 response carrying an "error" (quota, invalid
+    key) other than "no results", which is never cached.
+    """
+    global _negative_hits, _negative_writes
+
+    key = make_key("serpapi", normalize_params(params)) if SEARCH_CACHE_ENABLED else None
+    if key is not None:
+        data = _search_cache.get(key)
+        if data is not MISSING:
+            if _is_empty(data):
+                with _lock:
+                    _negative_hits += 1
+            return data
+
+    r = http_client.get(SERPAPI_URL, params=params, timeout=timeout or http_client.host_timeout(SERPAPI_URL))
+    if not r.ok:
+        return None
+    data = {k: v for k, v in r.json().items() if k not in _DROP_KEYS}
+    error = data.get("error")
+    if error and _NO_RESULTS_ERROR not in str(error):
+        raise SerpApiError(str(error))
+
+    if key is not None:
+        if _is_empty(data):
+            _search_cache.put(key, data, SEARCH_CACHE_NEGATIVE_TTL)
+            with _lock:
+                _negative_writes += 1
+        else:
+            _search_cache.put(key, data, ttl or SEARCH_CACHE_TTL)
+    return data
+
+
+def search_cache_stats() -> Dict[str, Any]:
+    out = _search_cache.stats()
+    with _lock:
+        out['negative_hits'] = _negative_hits
+        out['negative_writes'] = _negative_writes
+    return out
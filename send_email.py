@@ -2,8 +2,6 @@ import os
 from datetime import datetime
 import smtplib
 import yfinance as yf
-import matplotlib.pyplot as plt
-import mplcyberpunk
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
@@ -21,6 +19,10 @@ from google.genai import types
 import re
 from urllib.parse import quote
 from stock_metrics import get_comprehensive_stock_metrics, format_metrics_html, generate_stock_summary_table
+from stock_analysis import load_price_panel, week_window
+from parallel import run_bounded
+from config import STOCK_MAX_WORKERS, CHART_EMAIL_PROFILE
+from charts import chart_job, render_chart, render_charts
 import concurrent.futures
 import contextlib
 import io
@@ -34,11 +36,14 @@ from html_builders import (
     create_stock_metrics_section
 )
 from news_fetchers import (
-    fetch_llm_news_for_section,
+    fetch_llm_news_for_sections,
     fetch_news_from_multiple_apis,
     refine_articles as nf_refine_articles,
+    assign_digest_sections as nf_assign_digest_sections,
+    annotate_seen_stories as nf_annotate_seen_stories,
     validate_and_fix_urls as nf_validate_and_fix_urls,
     is_recent_article as nf_is_recent_article,
+    reset_article_search_memo,
 )
 
 STOCKS = [
@@ -100,40 +105,45 @@ SUBJECT = "📊 Weekly Digest – Stock + News" if is_monday_check else "📰 Da
 DATE_STR = datetime.now().strftime("%B %d, %Y")
 
 # === STOCK GRAPH ===
-def plot_stock_chart(ticker, name=None, period="7d"):
-    """Plot stock chart for specified period (default 7 days for weekly tracking)"""
-    from config import STATIC_DIR
-    os.makedirs(STATIC_DIR, exist_ok=True)
-    
-    data = yf.Ticker(ticker).history(period=period)
-    plt.style.use("cyberpunk")
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(data.index, data["Close"], label=f"{name or ticker} Closing Price", linewidth=2.2)
-    
-    # Calculate percentage change
-    if len(data) > 0:
-        start_price = data["Close"].iloc[0]
-        end_price = data["Close"].iloc[-1]
-        pct_change = ((end_price - start_price) / start_price) * 100
-        period_text = "7-Day" if period == "7d" else period.upper()
-        ax.set_title(f"{name or ticker} – {period_text} Trend ({pct_change:+.2f}%)", fontsize=14)
-    else:
-        ax.set_title(f"{name or ticker} – {period.upper()} Trend", fontsize=14)
-    
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price (Local)")
-    ax.legend()
-    mplcyberpunk.add_glow_effects()
-    # Save to static directory
-    filename = f"{ticker}_{period}.png"
-    path = os.path.join(STATIC_DIR, filename)
-    plt.tight_layout()
-    plt.savefig(path, dpi=300)
-    plt.close()
-    return path
+def stock_chart_job(ticker, name=None, period="7d", data=None, date=None):
+    """
+    Build a charts.chart_job for a ticker.
+    Pass data (a daily frame for the period) to reuse already-downloaded prices.
+    """
+    if (data is None or len(data) == 0) and period == "7d":
+        hist = load_price_panel([ticker]).get(ticker)
+        data = week_window(hist) if hist is not None else None
+    if data is None or len(data) == 0:
+        data = yf.Ticker(ticker).history(period=period)
+    return chart_job(ticker, data, name=name, period=period, date=date)
+
+
+def plot_stock_chart(ticker, name=None, period="7d", data=None, profile=CHART_EMAIL_PROFILE):
+    """
+    Plot stock chart for specified period (default 7 days for weekly tracking).
+    Renders in this process; batch callers should use render_stock_charts.
+    """
+    return render_chart(stock_chart_job(ticker, name, period, data), profile)['path']
+
+
+def render_stock_charts(stocks, price_panel, profile=CHART_EMAIL_PROFILE, date=None):
+    """
+    Render 7-day charts for all stocks in the chart process pool.
+    Returns {ticker: {'path', 'url', ...}} as stored by chart_store for the run date.
+    """
+    print(f"\n📈 Rendering {len(stocks)} 7-day charts ({profile})...", flush=True)
+    jobs = []
+    for s in stocks:
+        hist = price_panel.get(s["ticker"])
+        try:
+            jobs.append(stock_chart_job(s["ticker"], s["name"], data=week_window(hist) if hist is not None else None, date=date))
+        except Exception as e:
+            print(f"  ✗ Error loading chart data for {s['ticker']}: {e}", flush=True)
+    return render_charts(jobs, profile=profile)
 
 # === FETCH AI NEWS ===
-def fetch_ai_news():
+def fetch_ai_news(sections=None, on_section=None):
+    """Fetch LLM articles for the given sections (default: all), calling on_section(section, articles) as each finishes."""
     # Use SECTION_ORDER to ensure consistent ordering
     prompt_map = {
         "UAE OOH": uae_ooh_prompt,
@@ -144,36 +154,22 @@ def fetch_ai_news():
         "Global Business": global_business_prompt
     }
 
+    # Use helper to collect from all LLMs; every section x provider pair runs concurrently
+    llm_config_with_key = dict(MODEL_CONFIG)
+    llm_config_with_key["perplexity_api_key"] = PERPLEXITY_API_KEY
+    llm_config_with_key["test_mode"] = TEST_MODE
     # Use SECTION_ORDER instead of prompt_map.keys() to ensure correct order
-    sections = SECTION_ORDER
-    all_section_articles = {}
-    
-    def _process_section(key: str):
-        prompt = prompt_map[key]
-        # Print section header first
-        print(f"\n🔍 Fetching {key}:", flush=True)
-        
-        # Use helper to collect from all LLMs
-        llm_config_with_key = dict(MODEL_CONFIG)
-        llm_config_with_key["perplexity_api_key"] = PERPLEXITY_API_KEY
-        llm_config_with_key["test_mode"] = TEST_MODE
-        collected = fetch_llm_news_for_section(
-            prompt=prompt,
-            llm_enabled=LLM_ENABLED,
-            llm_config=llm_config_with_key,
-            clients={"openai": client, "gemini": gemini_client}
-        )
-        
-        return key, collected
-
-    for k in sections:
-        sec, articles = _process_section(k)
-        all_section_articles[sec] = articles
-
-    return all_section_articles
+    wanted = sections or SECTION_ORDER
+    return fetch_llm_news_for_sections(
+        prompts={key: prompt_map[key] for key in SECTION_ORDER if key in wanted},
+        llm_enabled=LLM_ENABLED,
+        llm_config=llm_config_with_key,
+        clients={"openai": client, "gemini": gemini_client},
+        on_section=on_section
+    )
 
 # === FETCH NEWS API ARTICLES ===
-def fetch_news():
+def fetch_news(sections=None, on_section=None):
     today = datetime.now()
     start_date = (today - timedelta(days=3)).strftime("%Y-%m-%d")
     end_date = today.strftime("%Y-%m-%d")
@@ -188,7 +184,7 @@ def fetch_news():
     }
 
     # Use SECTION_ORDER to ensure consistent ordering
-    sections = SECTION_ORDER
+    sections = [s for s in SECTION_ORDER if not sections or s in sections]
     all_section_articles = {}
     logs_by_section = {}
 
@@ -228,6 +224,8 @@ def fetch_news():
         all_section_articles[sec] = articles
         if logs:
             print(logs)
+        if on_section is not None:
+            on_section(sec, articles)
 
     return all_section_articles
 
@@ -280,6 +278,9 @@ def build_and_send_email(test_mode=False):
     msg["To"] = TO_EMAIL
     msg["Subject"] = SUBJECT
 
+    # Article search lookups are memoized per run
+    reset_article_search_memo()
+
     print("🔍 Fetching AI-generated articles...")
     ai_articles = fetch_ai_news()
     if test_mode:
@@ -301,6 +302,10 @@ def build_and_send_email(test_mode=False):
         merged = ai_items + news_items
         filtered_by_date = [a for a in merged if nf_is_recent_article(a)]
         merged_articles[section] = filtered_by_date
+    # Demote stories an earlier digest already published
+    merged_articles = nf_annotate_seen_stories(merged_articles, datetime.now().strftime("%Y-%m-%d"))
+    # A story found under several sections is refined in one of them only
+    merged_articles = nf_assign_digest_sections(merged_articles, SECTION_ORDER)
 
     print("\n🧹 Refining and filtering merged articles...")
     # Use helper to refine per section
@@ -344,74 +349,67 @@ def build_and_send_email(test_mode=False):
         else:
             print("📈 It's Monday! Fetching comprehensive OOH stock metrics...")
 
+        # One batched price download shared by metrics and charts
+        price_panel = load_price_panel([s["ticker"] for s in STOCKS])
+        charts = render_stock_charts(STOCKS, price_panel, CHART_EMAIL_PROFILE)
+
         # Parallelize per-stock work with clean logging per task
         def _process_stock(stock):
-            buf = io.StringIO()
-            img_path = None
+            img_path = charts.get(stock["ticker"], {}).get('path')
             metrics = None
+            # run_bounded captures each ticker's output, so logger lines land in its log too
             def _logger(message: str):
-                try:
-                    buf.write(message + "\n")
-                except Exception:
-                    pass
-            with contextlib.redirect_stdout(buf):
-                print(f"\n📊 Fetching metrics for {stock['name']} ({stock['ticker']})...")
-                llm_clients = {
-                    "gemini": gemini_client if LLM_ENABLED.get("gemini") else None,
-                    "openai": client if LLM_ENABLED.get("openai") else None
+                print(message)
+            print(f"\n📊 Fetching metrics for {stock['name']} ({stock['ticker']})...")
+            llm_clients = {
+                "gemini": gemini_client if LLM_ENABLED.get("gemini") else None,
+                "openai": client if LLM_ENABLED.get("openai") else None
+            }
+            llm_config_with_key = MODEL_CONFIG.copy()
+            llm_config_with_key["perplexity_api_key"] = PERPLEXITY_API_KEY
+            try:
+                metrics = get_comprehensive_stock_metrics(
+                    stock["ticker"],
+                    stock["name"],
+                    llm_enabled=LLM_ENABLED,
+                    llm_config=llm_config_with_key,
+                    clients=llm_clients,
+                    logger=_logger,
+                    price_history=price_panel.get(stock["ticker"])
+                )
+                if test_mode and metrics and 'error' not in metrics:
+                    print(f"  ✓ Current Price: {metrics['section_a']['Current Price']}")
+                    print(f"  ✓ Week Change: {metrics['section_a']['% Change WoW']}")
+                    print(f"  ✓ Market Cap: {metrics['section_a']['Market Cap']}")
+                    print(f"  ✓ P/E Ratio: {metrics['section_a']['P/E Ratio']}")
+                    print(f"  ✓ Revenue: {metrics['section_b']['TTM Revenue']}")
+                    print(f"  ✓ EBITDA Margin: {metrics['section_b']['EBITDA Margin']}")
+                    if metrics.get('news'):
+                        print(f"  ✓ Latest News: {metrics['news'][0]['title'][:60]}...")
+                elif test_mode and metrics and 'error' in metrics:
+                    print(f"  ✗ ERROR: {metrics['error']}")
+            except Exception as e:
+                metrics = {
+                    'company': stock['name'],
+                    'ticker': stock['ticker'],
+                    'error': str(e),
+                    'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M")
                 }
-                llm_config_with_key = MODEL_CONFIG.copy()
-                llm_config_with_key["perplexity_api_key"] = PERPLEXITY_API_KEY
-                try:
-                    metrics = get_comprehensive_stock_metrics(
-                        stock["ticker"],
-                        stock["name"],
-                        llm_enabled=LLM_ENABLED,
-                        llm_config=llm_config_with_key,
-                        clients=llm_clients,
-                        logger=_logger
-                    )
-                    if test_mode and metrics and 'error' not in metrics:
-                        print(f"  ✓ Current Price: {metrics['section_a']['Current Price']}")
-                        print(f"  ✓ Week Change: {metrics['section_a']['% Change WoW']}")
-                        print(f"  ✓ Market Cap: {metrics['section_a']['Market Cap']}")
-                        print(f"  ✓ P/E Ratio: {metrics['section_a']['P/E Ratio']}")
-                        print(f"  ✓ Revenue: {metrics['section_b']['TTM Revenue']}")
-                        print(f"  ✓ EBITDA Margin: {metrics['section_b']['EBITDA Margin']}")
-                        if metrics.get('news'):
-                            print(f"  ✓ Latest News: {metrics['news'][0]['title'][:60]}...")
-                    elif test_mode and metrics and 'error' in metrics:
-                        print(f"  ✗ ERROR: {metrics['error']}")
-                except Exception as e:
-                    metrics = {
-                        'company': stock['name'],
-                        'ticker': stock['ticker'],
-                        'error': str(e),
-                        'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M")
-                    }
-                    print(f"  ✗ Error fetching metrics: {e}")
-
-                # Chart generation
-                try:
-                    if test_mode:
-                        print(f"  📈 Generating 7-day chart...")
-                    img_path = plot_stock_chart(stock["ticker"], stock["name"])
-                    if test_mode:
-                        print(f"  ✓ Chart saved to: {img_path}")
-                except Exception as e:
-                    print(f"  ✗ Error generating chart: {e}")
+                print(f"  ✗ Error fetching metrics: {e}")
 
             return {
                 'ticker': stock['ticker'],
                 'name': stock['name'],
                 'metrics': metrics,
                 'img_path': img_path,
-                'log': buf.getvalue()
             }
 
-        # Sequential stock processing
-        for s in STOCKS:
-            res = _process_stock(s)
+        # Tickers run concurrently; results and logs come back in STOCKS order
+        tasks = [(s['ticker'], lambda s=s: _process_stock(s)) for s in STOCKS]
+        for done in run_bounded(tasks, max_workers=STOCK_MAX_WORKERS):
+            res = done['value']
+            if not res:
+                continue
             if res['metrics']:
                 stock_metrics.append(res['metrics'])
             if res['img_path']:
@@ -420,8 +418,6 @@ def build_and_send_email(test_mode=False):
                     'ticker': res['ticker'],
                     'img_path': res['img_path']
                 })
-            if res['log']:
-                print(res['log'])
     else:
         print("📅 Not Monday - skipping stock analysis")
 
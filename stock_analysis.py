@@ -6,13 +6,34 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Callable
+import concurrent.futures
 import json
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Set, Tuple
+from zoneinfo import ZoneInfo
 from json_helpers import format_json_schema
 from llm_core import call_openai, call_perplexity, call_gemini
-import requests
-from config import SERPAPI_KEY
+from search_cache import serpapi_search
+import price_store
+from parallel import run_bounded
+from disk_cache import MISSING, make_key, open_cache
+from config import (
+    SERPAPI_KEY, LLM_CACHE_TTLS, PRICE_HISTORY_DAYS,
+    FUNDAMENTALS_CACHE_PATH, FUNDAMENTALS_CACHE_MAX_MB, FUNDAMENTALS_TTL, FUNDAMENTALS_MAX_STALE,
+)
+
+_fundamentals_cache = open_cache(FUNDAMENTALS_CACHE_PATH, FUNDAMENTALS_CACHE_MAX_MB)
+# Background refreshes of stale fundamentals; keys are in _refreshing while queued or running
+_refresh_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="fundamentals")
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
+
+_MARKET_TZ = ZoneInfo("America/New_York")
+_MARKET_CLOSE_HOUR = 16
+# Relative close difference on a shared day that means Yahoo re-adjusted the history
+_ADJUST_TOLERANCE = 1e-4
 
 
 def format_large_number(num: float) -> str:
@@ -50,26 +71,200 @@ def get_avg_volume(hist_1w: pd.DataFrame, info: Dict[str, Any]) -> float:
     return info.get('averageVolume', 0)
 
 
-def fetch_basic_stock_data(ticker_symbol: str) -> Dict[str, Any]:
+def _fetch_fundamental(kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+    value = fetch()
+    if not value:
+        raise ValueError(f"empty {kind} response")
+    _fundamentals_cache.put(key, {"fetched_at": time.time(), "value": value}, FUNDAMENTALS_MAX_STALE)
+    return value
+
+
+def _refresh_fundamental(kind: str, ticker_symbol: str, key: str, fetch: Callable[[], Any]) -> None:
+    try:
+        _fetch_fundamental(kind, key, fetch)
+    except Exception as e:
+        print(f"     ⚠️  Background refresh of {kind} for {ticker_symbol} failed: {str(e)[:60]}", flush=True)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _cached_fundamental(kind: str, ticker_symbol: str, fetch: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Cached yfinance fundamental for a ticker, as (value, is_stale).
+    Entries younger than FUNDAMENTALS_TTL are served without a request. Older ones
+    (up to FUNDAMENTALS_MAX_STALE) are served at once, flagged stale, while one
+    background refresh per key updates the cache for the next caller. Only a
+    missing or expired entry is fetched inline, and that fetch's errors propagate.
+    """
+    key = make_key("yf", kind, ticker_symbol.upper())
+    cached = _fundamentals_cache.get(key)
+    if cached is not MISSING:
+        age = time.time() - cached["fetched_at"]
+        if age < FUNDAMENTALS_TTL:
+            return cached["value"], False
+        if age < FUNDAMENTALS_MAX_STALE:
+            with _refreshing_lock:
+                queue = key not in _refreshing
+                _refreshing.add(key)
+            if queue:
+                _refresh_pool.submit(_refresh_fundamental, kind, ticker_symbol, key, fetch)
+            return cached["value"], True
+    return _fetch_fundamental(kind, key, fetch), False
+
+
+def get_ticker_info(ticker: Any) -> Tuple[Dict[str, Any], bool]:
+    """ticker.info through the fundamentals cache, as (info, is_stale)."""
+    # json round-trip drops numpy/pandas scalars the cache can't store
+    return _cached_fundamental("info", ticker.ticker, lambda: json.loads(json.dumps(ticker.info, default=str)))
+
+
+def _latest_recommendation(ticker: Any) -> Dict[str, str]:
+    recommendations = ticker.recommendations
+    if recommendations is None or len(recommendations) == 0:
+        return {"none": "true"}
+    latest = recommendations.iloc[-1]
+    return {"toGrade": str(latest.get('toGrade', 'N/A')), "firm": str(latest.get('firm', 'N/A'))}
+
+
+def _download_panel(tickers: List[str], **window: Any) -> Dict[str, pd.DataFrame]:
+    """One batched yf.download for several tickers, split into {ticker: frame}."""
+    try:
+        data = yf.download(
+            tickers,
+            group_by="ticker",
+            auto_adjust=True,  # same basis as history(); re-adjustments are caught in load_price_panel
+            threads=True,
+            progress=False,
+            **window,
+        )
+    except Exception as e:
+        print(f"   ⚠️  Batched download failed: {e}", flush=True)
+        return {}
+
+    panel: Dict[str, pd.DataFrame] = {}
+    for symbol in tickers:
+        try:
+            frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+        except KeyError:
+            continue
+        # Tickers on other exchanges leave NaN rows on days their market was closed
+        frame = frame.dropna(how="all")
+        if len(frame) > 0:
+            panel[symbol] = frame
+    return panel
+
+
+def last_closed_session(now: Optional[datetime] = None) -> str:
+    """
+    Date (YYYY-MM-DD) of the latest US session that has closed: today after 16:00 New
+    York time, otherwise the previous day, stepping back over weekends. Exchange
+    holidays aren't known, so on those days a sync just finds nothing new.
+    """
+    now = (now or datetime.now(_MARKET_TZ)).astimezone(_MARKET_TZ)
+    day = now.date()
+    if now.hour < _MARKET_CLOSE_HOUR:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+
+def _closed_bars(frame: pd.DataFrame, session: str) -> pd.DataFrame:
+    """Drop bars after `session`; a session still trading would be stored with partial values."""
+    return frame[[pd.Timestamp(ts).strftime('%Y-%m-%d') <= session for ts in frame.index]]
+
+
+def _needs_readjust(stored: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+    """True when fresh closes disagree with stored ones on a shared day, i.e. a split or dividend was applied."""
+    old = {pd.Timestamp(ts).strftime('%Y-%m-%d'): close for ts, close in stored['Close'].items()}
+    for ts, close in fresh['Close'].items():
+        prev = old.get(pd.Timestamp(ts).strftime('%Y-%m-%d'))
+        if prev is not None and not pd.isna(close) and abs(prev - close) > abs(close) * _ADJUST_TOLERANCE:
+            return True
+    return False
+
+
+def load_price_panel(tickers: List[str], days: int = 365) -> Dict[str, pd.DataFrame]:
+    """
+    Daily OHLCV for every ticker over the last `days`, served from the local price store.
+    The store is first brought up to date with batched downloads: a full year for
+    tickers it has never seen and the recent bars for those missing the last closed
+    session. Those recent downloads overlap a week of stored bars; a ticker whose
+    overlapping closes changed was re-adjusted by Yahoo and gets its year replaced.
+    If yfinance fails, whatever is already stored is returned. Tickers with no bars
+    at all are omitted, so callers fall back to a per-ticker history() for them.
+    """
+    if not tickers:
+        return {}
+    today = datetime.now().date()
+    session = last_closed_session()
+    last = price_store.last_bar_dates(tickers)
+    unseen = [t for t in tickers if t not in last]
+    behind = [t for t in tickers if t in last and last[t] < session]
+
+    fetched: Dict[str, pd.DataFrame] = {}
+    replaced: Dict[str, pd.DataFrame] = {}
+    if unseen:
+        print(f"📈 Downloading 1y price history for {len(unseen)} new tickers in one batch...", flush=True)
+        fetched.update(_download_panel(unseen, period="1y"))
+    if behind:
+        start = (min(datetime.strptime(last[t], "%Y-%m-%d").date() for t in behind) - timedelta(days=7)).isoformat()
+        print(f"📈 Updating prices for {len(behind)} tickers since {start}...", flush=True)
+        readjust = []
+        for t, frame in _download_panel(behind, start=start).items():
+            if _needs_readjust(price_store.read_bars(t, start), frame):
+                readjust.append(t)
+            else:
+                fetched[t] = frame
+        if readjust:
+            print(f"📈 Re-downloading 1y price history for {len(readjust)} tickers adjusted for splits/dividends...", flush=True)
+            replaced = _download_panel(readjust, period="1y")
+
+    written = sum(price_store.upsert_bars(t, _closed_bars(frame, session)) for t, frame in fetched.items())
+    written += sum(price_store.upsert_bars(t, _closed_bars(frame, session), replace=True) for t, frame in replaced.items())
+    price_store.prune_bars((today - timedelta(days=PRICE_HISTORY_DAYS)).isoformat())
+
+    since = (today - timedelta(days=days)).isoformat()
+    panel = {}
+    for t in tickers:
+        frame = price_store.read_bars(t, since)
+        if len(frame) > 0:
+            panel[t] = frame
+    print(f"   ✅ Price store: {written} bars written, history for {len(panel)}/{len(tickers)} tickers", flush=True)
+    return panel
+
+
+def week_window(hist: pd.DataFrame, days: int = 7) -> pd.DataFrame:
+    """The last `days` calendar days of a daily frame - what history(period="7d") returns."""
+    if len(hist) == 0:
+        return hist
+    return hist[hist.index > hist.index[-1] - pd.Timedelta(days=days)]
+
+
+def fetch_basic_stock_data(ticker_symbol: str, hist_1y: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Fetch basic stock data from yfinance.
     Returns ticker, info, and history data.
+    Pass hist_1y (e.g. from load_price_panel) to skip the per-ticker price lookup;
+    the 7-day window is always derived from the 1-year frame.
     """
     print(f"     📈 Fetching yfinance data for {ticker_symbol}...", flush=True)
     ticker = yf.Ticker(ticker_symbol)
     
     print(f"     📊 Getting company info...", flush=True)
-    info = ticker.info
-    
-    print(f"     📅 Fetching 1-year history...", flush=True)
-    hist_1y = ticker.history(period="1y")
+    info, info_stale = get_ticker_info(ticker)
     
-    print(f"     📅 Fetching 7-day history...", flush=True)
-    hist_1w = ticker.history(period="7d")
+    if hist_1y is None or len(hist_1y) == 0:
+        print(f"     📅 Fetching 1-year history...", flush=True)
+        hist_1y = load_price_panel([ticker_symbol]).get(ticker_symbol)
+        if hist_1y is None:
+            hist_1y = ticker.history(period="1y")
+    hist_1w = week_window(hist_1y)
     
-    # Get current price
+    # Get current price (a stale cached info would carry an old price, so prefer the latest bar)
     current_price = info.get('currentPrice', 0)
-    if current_price == 0 and len(hist_1w) > 0:
+    if (current_price == 0 or info_stale) and len(hist_1w) > 0:
         current_price = hist_1w['Close'].iloc[-1]
     
     print(f"     ✅ Basic data fetched. Current price: ${current_price:.2f}", flush=True)
@@ -79,7 +274,8 @@ def fetch_basic_stock_data(ticker_symbol: str) -> Dict[str, Any]:
         'info': info,
         'hist_1y': hist_1y,
         'hist_1w': hist_1w,
-        'current_price': current_price
+        'current_price': current_price,
+        'info_stale': info_stale,
     }
 
 
@@ -138,6 +334,30 @@ def calculate_financial_metrics(stock_data: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+def _run_providers(
+    llm_enabled: Dict[str, bool],
+    llm_config: Dict[str, Any],
+    clients: Dict[str, Any],
+    openai_fn: Callable[[], Any],
+    perplexity_fn: Callable[[], Any],
+    gemini_fn: Callable[[], Any],
+) -> Dict[str, Any]:
+    """
+    Run the enabled providers' calls concurrently.
+    Returns {provider: result} for calls that returned something, always in
+    openai/perplexity/gemini order so downstream prompts (and cache keys) are stable.
+    """
+    tasks = []
+    if llm_enabled.get("openai") and clients.get("openai"):
+        tasks.append(("openai", openai_fn))
+    if llm_enabled.get("perplexity") and llm_config.get("perplexity_api_key"):
+        tasks.append(("perplexity", perplexity_fn))
+    if llm_enabled.get("gemini") and clients.get("gemini"):
+        tasks.append(("gemini", gemini_fn))
+    results = run_bounded(tasks, max_workers=len(tasks))
+    return {r["key"]: r["value"] for r in results if r["error"] is None and r["value"] is not None}
+
+
 def get_operational_metrics(company_name: str, ticker_symbol: str, llm_enabled: Dict[str, bool], llm_config: Dict[str, Any], clients: Dict[str, Any], logger: Optional[Callable] = None) -> Dict[str, str]:
     all_metrics: Dict[str, Dict[str, str]] = {}
 
@@ -185,35 +405,35 @@ def get_operational_metrics(company_name: str, ticker_symbol: str, llm_enabled:
     )
 
     # OpenAI
-    if llm_enabled.get("openai") and clients.get("openai"):
+    def _openai():
         try:
-            data = call_openai(
+            return call_openai(
                 client=clients["openai"],
                 messages=prompt,
                 model=llm_config["openai_model"],
                 tools=[{"type": "web_search_preview"}],
                 json_schema=schema,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_metrics["openai"] = data
         except Exception as e:
             if logger: logger(f"OpenAI operational metrics error: {e}")
 
     # Perplexity
-    if llm_enabled.get("perplexity") and llm_config.get("perplexity_api_key"):
+    def _perplexity():
         try:
-            data = call_perplexity(
+            return call_perplexity(
                 api_key=llm_config["perplexity_api_key"],
                 messages=prompt,
                 model=llm_config["perplexity_model"],
                 json_schema=schema,
                 timeout=30,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_metrics["perplexity"] = data
         except Exception as e:
             if logger: logger(f"Perplexity operational metrics error: {e}")
 
     # Gemini
-    if llm_enabled.get("gemini") and clients.get("gemini"):
+    def _gemini():
         print(f"       🤖 Calling Gemini for operational data...", flush=True)
         try:
             json_instruction = (
@@ -225,13 +445,16 @@ def get_operational_metrics(company_name: str, ticker_symbol: str, llm_enabled:
                 messages=prompt,
                 model=llm_config["gemini_model"],
                 json_instruction=json_instruction,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_metrics["gemini"] = data
             print(f"       ✅ Gemini returned operational data", flush=True)
+            return data
         except Exception as e:
             print(f"       ❌ Gemini failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"Gemini operational metrics error: {e}")
 
+    all_metrics.update(_run_providers(llm_enabled, llm_config, clients, _openai, _perplexity, _gemini))
+
     # Aggregate via OpenAI
     if all_metrics and llm_enabled.get("openai") and clients.get("openai"):
         try:
@@ -254,6 +477,7 @@ def get_operational_metrics(company_name: str, ticker_symbol: str, llm_enabled:
                 messages=messages,
                 model=llm_config["openai_model"],
                 json_schema=agg_schema,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             return data
         except Exception as e:
@@ -308,7 +532,7 @@ def get_categorized_news(company_name: str, ticker_symbol: str, llm_enabled: Dic
     )
 
     # OpenAI
-    if llm_enabled.get("openai") and clients.get("openai"):
+    def _openai():
         print(f"       📰 OpenAI categorizing {company_name} news...", flush=True)
         try:
             data = call_openai(
@@ -317,15 +541,16 @@ def get_categorized_news(company_name: str, ticker_symbol: str, llm_enabled: Dic
                 model=llm_config["openai_model"],
                 tools=[{"type": "web_search_preview"}],
                 json_schema=schema,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_news["openai"] = data
             print(f"       ✅ OpenAI categorized news ready", flush=True)
+            return data
         except Exception as e:
             print(f"       ❌ OpenAI categorization failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"OpenAI categorized news error: {e}")
 
     # Perplexity
-    if llm_enabled.get("perplexity") and llm_config.get("perplexity_api_key"):
+    def _perplexity():
         print(f"       📰 Perplexity categorizing {company_name} news...", flush=True)
         try:
             data = call_perplexity(
@@ -334,15 +559,16 @@ def get_categorized_news(company_name: str, ticker_symbol: str, llm_enabled: Dic
                 model=llm_config["perplexity_model"],
                 json_schema=schema,
                 timeout=30,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_news["perplexity"] = data
             print(f"       ✅ Perplexity categorized news ready", flush=True)
+            return data
         except Exception as e:
             print(f"       ❌ Perplexity categorization failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"Perplexity categorized news error: {e}")
 
     # Gemini
-    if llm_enabled.get("gemini") and clients.get("gemini"):
+    def _gemini():
         print(f"       📰 Gemini categorizing {company_name} news...", flush=True)
         try:
             json_instruction = (
@@ -353,13 +579,16 @@ def get_categorized_news(company_name: str, ticker_symbol: str, llm_enabled: Dic
                 messages=prompt,
                 model=llm_config["gemini_model"],
                 json_instruction=json_instruction,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
-            all_news["gemini"] = data
             print(f"       ✅ Gemini categorized news ready", flush=True)
+            return data
         except Exception as e:
             print(f"       ❌ Gemini categorization failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"Gemini categorized news error: {e}")
 
+    all_news.update(_run_providers(llm_enabled, llm_config, clients, _openai, _perplexity, _gemini))
+
     # Aggregate with OpenAI
     if all_news and llm_enabled.get("openai") and clients.get("openai"):
         print(f"       🔄 Aggregating news from {len(all_news)} sources with OpenAI...", flush=True)
@@ -383,6 +612,7 @@ def get_categorized_news(company_name: str, ticker_symbol: str, llm_enabled: Dic
                 messages=messages,
                 model=llm_config["openai_model"],
                 json_schema=agg_schema,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             print(f"       ✅ News aggregation complete", flush=True)
             return data
@@ -418,7 +648,7 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
     items: List[Dict[str, str]] = []
 
     # OpenAI: object with items array
-    if llm_enabled.get("openai") and clients.get("openai"):
+    def _openai():
         try:
             schema = format_json_schema(
                 {
@@ -450,6 +680,7 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
                 model=llm_config["openai_model"],
                 tools=[{"type": "web_search_preview"}],
                 json_schema=schema,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             # Fix URLs immediately after extraction
             # Handle both list and dict responses
@@ -460,14 +691,14 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
             
             for item in openai_items:
                 verify_stock_article_url(item, company_name, ticker_symbol)
-            items.extend(openai_items)
             print(f"       ✅ OpenAI found {len(openai_items)} news items (URLs verified)", flush=True)
+            return openai_items
         except Exception as e:
             print(f"       ❌ OpenAI news failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"OpenAI company news error: {e}")
 
     # Perplexity: top-level array
-    if llm_enabled.get("perplexity") and llm_config.get("perplexity_api_key"):
+    def _perplexity():
         try:
             schema_arr = format_json_schema(
                 {"type": "array", "items": {"type": "object", "properties": {
@@ -481,13 +712,14 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
                 model=llm_config["perplexity_model"],
                 json_schema=schema_arr,
                 timeout=30,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             # Fix URLs immediately after extraction
             if isinstance(data, list):
                 for item in data:
                     verify_stock_article_url(item, company_name, ticker_symbol)
-                items.extend(data)
                 print(f"       ✅ Perplexity found {len(data)} news items (URLs verified)", flush=True)
+                return data
             else:
                 print(f"       ⚠️  Perplexity returned unexpected format", flush=True)
         except Exception as e:
@@ -495,7 +727,7 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
             if logger: logger(f"Perplexity company news error: {e}")
 
     # Gemini: array via instruction
-    if llm_enabled.get("gemini") and clients.get("gemini"):
+    def _gemini():
         print(f"       🗞️  Gemini searching for {company_name} news...", flush=True)
         try:
             json_instruction = (
@@ -507,6 +739,7 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
                 messages=prompt,
                 model=llm_config["gemini_model"],
                 json_instruction=json_instruction,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             if isinstance(data, dict) and "items" in data:
                 data = data["items"]
@@ -514,14 +747,17 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
                 # Fix URLs immediately after extraction
                 for item in data:
                     verify_stock_article_url(item, company_name, ticker_symbol)
-                items.extend(data)
                 print(f"       ✅ Gemini found {len(data)} news items (URLs verified)", flush=True)
+                return data
             else:
                 print(f"       ⚠️  Gemini returned unexpected format", flush=True)
         except Exception as e:
             print(f"       ❌ Gemini news failed: {str(e)[:50]}...", flush=True)
             if logger: logger(f"Gemini company news error: {e}")
 
+    for provider_items in _run_providers(llm_enabled, llm_config, clients, _openai, _perplexity, _gemini).values():
+        items.extend(provider_items)
+
     # Verify all URLs with SerpAPI before refinement
     if items and SERPAPI_KEY:
         print(f"       🔍 Verifying {len(items)} article URLs with web search...", flush=True)
@@ -585,6 +821,7 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
                 messages=messages,
                 model=llm_config["openai_model"],
                 json_schema=schema_ref,
+                cache_ttl=LLM_CACHE_TTLS["stock_research"],
             )
             items = data.get("items", [])[:max_items]
         except Exception as e:
@@ -617,14 +854,13 @@ def get_company_news_items(company_name: str, ticker_symbol: str, llm_enabled: D
 
 def get_analyst_signal(ticker: Any) -> str:
     """
-    Get latest analyst recommendation.
+    Get latest analyst recommendation (cached like ticker.info).
     """
     try:
-        recommendations = ticker.recommendations
-        if recommendations is not None and len(recommendations) > 0:
-            latest_rec = recommendations.iloc[-1]
-            return f"Latest: {latest_rec.get('toGrade', 'N/A')} by {latest_rec.get('firm', 'N/A')}"
-        return "No recent updates"
+        latest, _ = _cached_fundamental("recommendations", ticker.ticker, lambda: _latest_recommendation(ticker))
+        if latest.get("none"):
+            return "No recent updates"
+        return f"Latest: {latest.get('toGrade', 'N/A')} by {latest.get('firm', 'N/A')}"
     except Exception:
         return "N/A"
 
@@ -657,9 +893,8 @@ def verify_stock_article_url(article: Dict[str, Any], company_name: str, ticker:
             "num": 5,
         }
         
-        r = requests.get("https://serpapi.com/search", params=params, timeout=30)
-        if r.ok:
-            data = r.json()
+        data = serpapi_search(params)
+        if data:
             for result in data.get("organic_results", []):
                 result_title = result.get("title", "").lower()
                 if title.lower() in result_title or len(set(title.lower().split()) & set(result_title.split())) > 3:
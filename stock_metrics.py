@@ -10,6 +10,7 @@ import concurrent.futures
 # Import helper modules
 from llm_core import call_openai, call_perplexity, call_gemini
 from json_helpers import extract_json_from_text, format_json_schema
+from parallel import run_bounded
 from stock_analysis import (
     get_operational_metrics,
     get_categorized_news,
@@ -78,16 +79,17 @@ def fetch_company_news_items(company_name, ticker_symbol, llm_enabled, llm_confi
         max_items=max_items
     )
 
-def get_comprehensive_stock_metrics(ticker_symbol, company_name, llm_enabled=None, llm_config=None, clients=None, logger=None):
+def get_comprehensive_stock_metrics(ticker_symbol, company_name, llm_enabled=None, llm_config=None, clients=None, logger=None, price_history=None):
     """
     Fetch comprehensive stock metrics for OOH media companies
     Returns dict with all requested metrics organized by sections
+    price_history: optional 1-year daily frame (from load_price_panel) to reuse
     """
     try:
         print(f"     🔍 Starting comprehensive metrics collection...", flush=True)
         
         # Fetch basic stock data
-        stock_data = fetch_basic_stock_data(ticker_symbol)
+        stock_data = fetch_basic_stock_data(ticker_symbol, hist_1y=price_history)
         
         # Calculate market metrics (Section A)
         print(f"     📊 Calculating market metrics...", flush=True)
@@ -97,33 +99,52 @@ def get_comprehensive_stock_metrics(ticker_symbol, company_name, llm_enabled=Non
         print(f"     💰 Calculating financial metrics...", flush=True)
         section_b = calculate_financial_metrics(stock_data)
         
-        # Section C: Operational Indicators (fetch via LLM if enabled)
+        # Section C/D: the three LLM-backed lookups (operational metrics, categorized
+        # news, company news) plus the analyst signal run concurrently; each task's
+        # log is replayed in this order
         categorized_news = None
-        if llm_enabled and llm_config and clients:
-            # Sequential LLM calls for operational and categorized news
+        news_items = []
+        llm_on = bool(llm_enabled and llm_config and clients)
+        tasks = [("analyst", lambda: get_analyst_signal(stock_data['ticker']))]
+        if llm_on:
             llm_config_with_logger = dict(llm_config)
             llm_config_with_logger["__logger__"] = logger
-            
-            print(f"     🤖 Fetching operational metrics via LLMs...", flush=True)
-            try:
-                operational_data = fetch_operational_metrics(
+            tasks = [
+                ("operational", lambda: fetch_operational_metrics(
                     company_name, ticker_symbol, llm_enabled, llm_config_with_logger, clients
-                )
+                )),
+                ("categorized", lambda: fetch_categorized_news(
+                    company_name, ticker_symbol, llm_enabled, llm_config_with_logger, clients
+                )),
+                ("news", lambda: fetch_company_news_items(
+                    company_name, ticker_symbol, llm_enabled, llm_config, clients,
+                    logger=logger, max_items=3
+                )),
+            ] + tasks
+            print(f"     🤖 Fetching operational metrics, categorized news and company news via LLMs...", flush=True)
+        subtasks = {r['key']: r for r in run_bounded(tasks, max_workers=len(tasks))}
+
+        if llm_on:
+            if subtasks['operational']['error'] is None:
+                operational_data = subtasks['operational']['value'] or {}
                 print(f"     ✅ Operational metrics received", flush=True)
-            except Exception as e:
-                print(f"     ⚠️  Operational metrics failed: {str(e)[:50]}...", flush=True)
+            else:
+                print(f"     ⚠️  Operational metrics failed: {str(subtasks['operational']['error'])[:50]}...", flush=True)
                 operational_data = {}
-            
-            print(f"     📰 Fetching categorized news via LLMs...", flush=True)
-            try:
-                categorized_news = fetch_categorized_news(
-                    company_name, ticker_symbol, llm_enabled, llm_config_with_logger, clients
-                )
+
+            if subtasks['categorized']['error'] is None:
+                categorized_news = subtasks['categorized']['value']
                 print(f"     ✅ Categorized news received", flush=True)
-            except Exception as e:
-                print(f"     ⚠️  Categorized news failed: {str(e)[:50]}...", flush=True)
+            else:
+                print(f"     ⚠️  Categorized news failed: {str(subtasks['categorized']['error'])[:50]}...", flush=True)
                 categorized_news = None
 
+            if subtasks['news']['error'] is None:
+                news_items = subtasks['news']['value'] or []
+                print(f"     ✅ Found {len(news_items)} news items", flush=True)
+            else:
+                print(f"     ⚠️  News fetch failed: {str(subtasks['news']['error'])[:50]}...", flush=True)
+
             section_c = {
                 "% Digital Inventory": operational_data.get("digital_inventory", "Not disclosed"),
                 "Occupancy Rate": operational_data.get("occupancy_rate", "Not disclosed"),
@@ -141,27 +162,11 @@ def get_comprehensive_stock_metrics(ticker_symbol, company_name, llm_enabled=Non
             }
         
         # Section D: News & Signals
-        # Fetch news items
-        news_items = []
-        if llm_enabled and llm_config and clients:
-            print(f"     🗞️  Fetching latest company news...", flush=True)
-            try:
-                news_items = fetch_company_news_items(
-                    company_name, ticker_symbol, llm_enabled, llm_config, clients, 
-                    logger=logger, max_items=3
-                )
-                print(f"     ✅ Found {len(news_items)} news items", flush=True)
-            except Exception as e:
-                print(f"     ⚠️  News fetch failed: {str(e)[:50]}...", flush=True)
-                pass
-        
-        # Get analyst signal
-        print(f"     📊 Fetching analyst ratings...", flush=True)
-        analyst_signal = get_analyst_signal(stock_data['ticker'])
+        analyst_signal = subtasks['analyst']['value'] if subtasks['analyst']['error'] is None else "N/A"
         print(f"     ✅ Analyst signal: {analyst_signal if analyst_signal else 'None'}", flush=True)
         
         # Get categorized news if not already fetched above
-        if llm_enabled and llm_config and clients and categorized_news is None:
+        if llm_on and categorized_news is None:
             categorized_news = fetch_categorized_news(company_name, ticker_symbol, llm_enabled, llm_config, clients)
         
         return {
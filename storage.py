@@ -1,9 +1,15 @@
 import sqlite3
 import json
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple, Set
+from typing import Optional, Dict, Any, Callable, Iterator, List, Tuple, Set
 import os
-from config import DATABASE_PATH, DATA_DIR
+from config import COMPACT_LEGACY_DIGESTS, DATABASE_PATH, DATA_DIR
+from parallel import on_worker_task_done
+from dedup import normalize_text
+from url_canon import url_key
 
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -14,7 +20,18 @@ SCHEMA = """
 CREATE TABLE IF NOT EXISTS digests (
   date TEXT PRIMARY KEY,
   data_json TEXT NOT NULL,
-  created_at TEXT NOT NULL
+  created_at TEXT NOT NULL,
+  has_stocks INTEGER NOT NULL DEFAULT 0,
+  articles_indexed INTEGER NOT NULL DEFAULT 0
+);
+
+-- Digest documents split into zlib-compressed JSON parts: 'meta', 'section:<name>'
+-- and 'stocks_html'. digests.data_json is '' for rows stored this way.
+CREATE TABLE IF NOT EXISTS digest_parts (
+  date TEXT NOT NULL,
+  part TEXT NOT NULL,
+  data BLOB NOT NULL,
+  PRIMARY KEY (date, part)
 );
 
 CREATE TABLE IF NOT EXISTS saved_articles (
@@ -24,105 +41,715 @@ CREATE TABLE IF NOT EXISTS saved_articles (
   section TEXT,
   summary TEXT,
   saved_at TEXT NOT NULL,
-  published_date TEXT
+  published_date TEXT,
+  url_key TEXT
 );
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_url ON saved_articles(url);
+
+CREATE TABLE IF NOT EXISTS articles (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  digest_date TEXT NOT NULL,
+  section TEXT NOT NULL,
+  position INTEGER NOT NULL,
+  client TEXT,
+  source TEXT,
+  url TEXT,
+  title TEXT NOT NULL,
+  summary TEXT,
+  published_date TEXT,
+  verified INTEGER,
+  date_verification TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_date_section ON articles(digest_date, section, position);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+
+-- Stories seen by earlier runs, keyed by normalized title (see dedup.normalize_text).
+-- verified/verification_json hold the last search verification outcome;
+-- published_on is the first digest date the story appeared in.
+CREATE TABLE IF NOT EXISTS seen_stories (
+  title_key TEXT PRIMARY KEY,
+  url_key TEXT,
+  first_seen TEXT NOT NULL,
+  last_seen TEXT NOT NULL,
+  verified INTEGER,
+  verified_on TEXT,
+  verification_json TEXT,
+  published_on TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_seen_url ON seen_stories(url_key);
+CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen_stories(last_seen);
+
+CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+  run_date TEXT NOT NULL,
+  stage TEXT NOT NULL,
+  item TEXT NOT NULL,
+  data_json TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (run_date, stage, item)
+);
+"""
+
+# Full-text index over articles, kept in sync by triggers. Optional: SQLite
+# builds without FTS5 fall back to LIKE queries in search_articles.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+  title, summary, source, content='articles', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+  INSERT INTO articles_fts(rowid, title, summary, source) VALUES (new.id, new.title, new.summary, new.source);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+  INSERT INTO articles_fts(articles_fts, rowid, title, summary, source) VALUES ('delete', old.id, old.title, old.summary, old.source);
+END;
 """
 
+_fts_enabled = False
+
+# Milliseconds a writer waits on a locked database before raising
+BUSY_TIMEOUT_MS = 10000
+
+_local = threading.local()
+
+
 def _get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    """
+    Connection for the current thread, opened once with pragmas applied.
+    Runs in autocommit mode; wrap writes in transaction().
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == DB_PATH:
+        return conn
+    if conn is not None:
+        conn.close()
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
     conn.execute('PRAGMA journal_mode=WAL;')
     conn.execute('PRAGMA foreign_keys=ON;')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS};')
+    conn.execute('PRAGMA synchronous=NORMAL;')
+    _local.conn = conn
+    _local.path = DB_PATH
+    _local.depth = 0
     return conn
 
 
-def init_db() -> None:
+def close_conn() -> None:
+    """Close the current thread's connection (it is reopened on next use)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+# Connections live as long as their thread unless closed: run_bounded pool threads
+# close theirs after every task, and app.py closes each request thread's connection
+# at teardown and the background digest thread's when the build ends
+on_worker_task_done(close_conn)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Write transaction on the thread's connection: commits on success, rolls back on error.
+    BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue on
+    busy_timeout instead of failing with 'database is locked'. Nested calls join
+    the outer transaction.
+    """
     conn = _get_conn()
+    if _local.depth:
+        _local.depth += 1
+        try:
+            yield conn
+        finally:
+            _local.depth -= 1
+        return
+    conn.execute('BEGIN IMMEDIATE')
+    _local.depth = 1
     try:
-        conn.executescript(SCHEMA)
-        # Best-effort migration to add published_date if missing
+        yield conn
+        conn.execute('COMMIT')
+    except BaseException:
         try:
-            conn.execute('ALTER TABLE saved_articles ADD COLUMN published_date TEXT')
-        except Exception:
+            conn.execute('ROLLBACK')
+        except sqlite3.Error:
+            # SQLite may already have rolled back (e.g. after SQLITE_FULL); keep the original error
             pass
-        conn.commit()
+        raise
     finally:
-        conn.close()
+        _local.depth = 0
 
 
-def save_digest(date_str: str, data: Dict[str, Any]) -> None:
+def init_db() -> None:
     conn = _get_conn()
+    # executescript manages its own transaction, so run it in autocommit mode
+    conn.executescript(SCHEMA)
+    # Best-effort migration to add published_date if missing
+    try:
+        conn.execute('ALTER TABLE saved_articles ADD COLUMN published_date TEXT')
+    except Exception:
+        pass
+    # Migration: has_stocks flag so /stocks finds its date without loading data_json.
+    # Added as nullable so rows written before it stay NULL until backfilled.
+    try:
+        conn.execute('ALTER TABLE digests ADD COLUMN has_stocks INTEGER')
+    except sqlite3.OperationalError:
+        pass
+    _backfill_has_stocks(conn)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_digests_has_stocks ON digests(has_stocks, date)')
+    # Migration: marks digests whose articles are in the articles table, so ones
+    # with no articles at all are not re-parsed by _backfill_articles on every start
+    try:
+        conn.execute('ALTER TABLE digests ADD COLUMN articles_indexed INTEGER NOT NULL DEFAULT 0')
+    except sqlite3.OperationalError:
+        pass
+    # Migration: saved articles are looked up by canonical URL key (url_canon.url_key)
+    try:
+        conn.execute('ALTER TABLE saved_articles ADD COLUMN url_key TEXT')
+    except sqlite3.OperationalError:
+        pass
+    _backfill_saved_url_keys(conn)
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_url_key ON saved_articles(url_key)')
+    global _fts_enabled
     try:
+        conn.executescript(FTS_SCHEMA)
+        _fts_enabled = True
+    except sqlite3.OperationalError:
+        _fts_enabled = False
+    if _fts_enabled:
+        _sync_fts_index(conn)
+    if COMPACT_LEGACY_DIGESTS:
+        _compact_legacy_digests(conn)
+    _backfill_articles(conn)
+    _backfill_seen_stories(conn)
+    _rekey_seen_stories(conn)
+
+
+def _sync_fts_index(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild articles_fts when it doesn't cover every article, e.g. rows indexed
+    while this SQLite lacked FTS5, so /search finds them once it is available.
+    articles_fts reads its content from articles, so the index's own docsize
+    table is what tells how many rows were actually indexed.
+    """
+    indexed = conn.execute('SELECT COUNT(*) FROM articles_fts_docsize').fetchone()[0]
+    total = conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+    if indexed != total:
+        with transaction():
+            conn.execute("INSERT INTO articles_fts(articles_fts) VALUES('rebuild')")
+        print(f"🔎 Rebuilt the article search index ({indexed} → {total} articles)", flush=True)
+
+
+def _backfill_saved_url_keys(conn: sqlite3.Connection) -> None:
+    """
+    Bring every saved article's url_key up to date with url_canon, covering rows
+    saved before the column existed or under older canonicalization rules. Saves
+    that turn out to be variants of one canonical URL are merged into the earliest:
+    its blank section, summary and published_date are taken from the others, which
+    are deleted, so url_key stays unique.
+    """
+    rows = conn.execute(
+        'SELECT id, url, url_key, section, summary, published_date FROM saved_articles ORDER BY id'
+    ).fetchall()
+    groups: Dict[str, List[Tuple[Any, ...]]] = {}
+    for row in rows:
+        groups.setdefault(url_key(row[1]), []).append(row)
+    stale = [(key, members) for key, members in groups.items() if len(members) > 1 or members[0][2] != key]
+    if not stale:
+        return
+    merged = 0
+    with transaction():
+        # Clear first: a row's new key may still be held by another row's old one
+        conn.executemany('UPDATE saved_articles SET url_key = NULL WHERE id = ?', [(m[0],) for _, members in stale for m in members])
+        for key, members in stale:
+            keep, dupes = members[0], members[1:]
+            section, summary, published_date = (next((m[i] for m in members if m[i]), keep[i]) for i in (3, 4, 5))
+            conn.executemany('DELETE FROM saved_articles WHERE id = ?', [(m[0],) for m in dupes])
+            conn.execute(
+                'UPDATE saved_articles SET url_key = ?, section = ?, summary = ?, published_date = ? WHERE id = ?',
+                (key, section, summary, published_date, keep[0])
+            )
+            merged += len(dupes)
+    if merged:
+        print(f"🔗 Merged {merged} saved articles into earlier saves of the same page", flush=True)
+
+
+def _rekey_seen_stories(conn: sqlite3.Connection) -> None:
+    """Rewrite seen_stories.url_key values from the old '//host/path' format to url_canon.url_key."""
+    rows = conn.execute("SELECT title_key, url_key FROM seen_stories WHERE url_key LIKE '//%'").fetchall()
+    if rows:
+        with transaction():
+            conn.executemany(
+                'UPDATE seen_stories SET url_key = ? WHERE title_key = ?',
+                [(url_key('https:' + old), title_key) for title_key, old in rows]
+            )
+
+
+def _backfill_has_stocks(conn: sqlite3.Connection) -> None:
+    """Set has_stocks on digests that predate the column; a no-op once none are NULL."""
+    if not conn.execute('SELECT 1 FROM digests WHERE has_stocks IS NULL LIMIT 1').fetchone():
+        return
+    with transaction():
+        try:
+            conn.execute(
+                "UPDATE digests SET has_stocks = (COALESCE(json_extract(data_json, '$.stocks_html'), '') != '') "
+                "WHERE has_stocks IS NULL AND data_json != ''"
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without JSON1; the loop below covers these rows too
+            pass
+        pending = [r[0] for r in conn.execute('SELECT date FROM digests WHERE has_stocks IS NULL').fetchall()]
+        conn.executemany(
+            'UPDATE digests SET has_stocks = ? WHERE date = ?',
+            [(1 if get_digest_stocks_html(d) else 0, d) for d in pending]
+        )
+
+
+_digest_saved_listeners: List[Callable[[str], None]] = []
+
+
+def on_digest_saved(listener: Callable[[str], None]) -> None:
+    """Call listener(date_str) after save_digest writes a date in this process."""
+    _digest_saved_listeners.append(listener)
+
+
+def _index_articles(conn: sqlite3.Connection, date_str: str, data: Dict[str, Any]) -> None:
+    """Replace a date's rows in the normalized articles table with the digest's section articles."""
+    conn.execute('DELETE FROM articles WHERE digest_date = ?', (date_str,))
+    rows = []
+    for section, items in (data.get('sections') or {}).items():
+        for position, a in enumerate(items or []):
+            if not isinstance(a, dict) or not a.get('title'):
+                continue
+            verified = a.get('verified')
+            rows.append((
+                date_str, section, position, a.get('client'), a.get('source'), a.get('url'),
+                a['title'], a.get('summary'), a.get('date') or a.get('published_date'),
+                None if verified is None else int(bool(verified)), a.get('date_verification'),
+            ))
+    conn.executemany(
+        'INSERT INTO articles (digest_date, section, position, client, source, url, title, summary, published_date, verified, date_verification) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        rows
+    )
+
+
+def _backfill_articles(conn: sqlite3.Connection) -> None:
+    """Index digests saved before the articles table existed."""
+    rows = conn.execute('SELECT date FROM digests WHERE articles_indexed = 0').fetchall()
+    for (date_str,) in rows:
+        data = get_digest(date_str)
+        with transaction():
+            if data:
+                _index_articles(conn, date_str, data)
+            conn.execute('UPDATE digests SET articles_indexed = 1 WHERE date = ?', (date_str,))
+
+
+def _pack(obj: Any) -> bytes:
+    return zlib.compress(json.dumps(obj).encode('utf-8'), 6)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def _write_digest_parts(conn: sqlite3.Connection, date_str: str, data: Dict[str, Any]) -> None:
+    sections = data.get('sections') or {}
+    meta = {k: v for k, v in data.items() if k not in ('sections', 'stocks_html')}
+    # Keep section order; parts come back from SQLite in key order
+    meta['_section_order'] = list(sections)
+    rows = [(date_str, 'meta', _pack(meta))]
+    rows += [(date_str, f'section:{name}', _pack(items)) for name, items in sections.items()]
+    if 'stocks_html' in data:
+        rows.append((date_str, 'stocks_html', _pack(data['stocks_html'])))
+    conn.execute('DELETE FROM digest_parts WHERE date = ?', (date_str,))
+    conn.executemany('INSERT INTO digest_parts (date, part, data) VALUES (?, ?, ?)', rows)
+
+
+def _read_digest_parts(conn: sqlite3.Connection, date_str: str, parts: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Decoded parts for a date ({} if the digest is not stored in parts); only the requested parts are decompressed."""
+    if parts is None:
+        cur = conn.execute('SELECT part, data FROM digest_parts WHERE date = ?', (date_str,))
+    else:
+        wanted = ['meta'] + [p for p in parts if p != 'meta']
+        placeholders = ','.join('?' * len(wanted))
+        cur = conn.execute(f'SELECT part, data FROM digest_parts WHERE date = ? AND part IN ({placeholders})', [date_str] + wanted)
+    return {part: _unpack(blob) for part, blob in cur.fetchall()}
+
+
+def _assemble_digest(parts: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(parts['meta'])
+    order = data.pop('_section_order', [])
+    data['sections'] = {name: parts.get(f'section:{name}', []) for name in order}
+    if 'stocks_html' in parts:
+        data['stocks_html'] = parts['stocks_html']
+    return data
+
+
+def _compact_legacy_digests(conn: sqlite3.Connection) -> None:
+    """
+    Move digests still stored as plain data_json into compressed parts. Opt-in
+    (COMPACT_LEGACY_DIGESTS); data_json is only cleared once the parts read back
+    identical to it, otherwise the digest is left as it was.
+    """
+    dates = [r[0] for r in conn.execute("SELECT date FROM digests WHERE data_json != ''").fetchall()]
+    compacted = 0
+    for date_str in dates:
+        with transaction():
+            row = conn.execute('SELECT data_json FROM digests WHERE date = ?', (date_str,)).fetchone()
+            if not row or not row[0]:
+                continue
+            data = json.loads(row[0])
+            _write_digest_parts(conn, date_str, data)
+            expected = dict(data, sections=data.get('sections') or {})
+            if _assemble_digest(_read_digest_parts(conn, date_str)) != expected:
+                print(f"⚠️ Digest {date_str}: compressed parts do not round-trip, keeping data_json", flush=True)
+                conn.execute('DELETE FROM digest_parts WHERE date = ?', (date_str,))
+                continue
+            conn.execute("UPDATE digests SET data_json = '' WHERE date = ?", (date_str,))
+            compacted += 1
+    if dates:
+        print(f"🗜️ Compacted {compacted}/{len(dates)} legacy digests into parts", flush=True)
+
+
+def save_digest(date_str: str, data: Dict[str, Any]) -> None:
+    with transaction() as conn:
         conn.execute(
-            'INSERT OR REPLACE INTO digests (date, data_json, created_at) VALUES (?, ?, ?)',
-            (date_str, json.dumps(data), datetime.utcnow().isoformat())
+            'INSERT OR REPLACE INTO digests (date, data_json, created_at, has_stocks, articles_indexed) VALUES (?, ?, ?, ?, 1)',
+            (date_str, '', datetime.utcnow().isoformat(), 1 if data.get('stocks_html') else 0)
         )
-        conn.commit()
-    finally:
-        conn.close()
+        _write_digest_parts(conn, date_str, data)
+        _index_articles(conn, date_str, data)
+        _mark_published(conn, date_str, data)
+    for listener in _digest_saved_listeners:
+        listener(date_str)
+
+
+def _legacy_digest(conn: sqlite3.Connection, date_str: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute('SELECT data_json FROM digests WHERE date = ?', (date_str,)).fetchone()
+    if not row or not row[0]:
+        return None
+    return json.loads(row[0])
 
 
 def get_digest(date_str: str) -> Optional[Dict[str, Any]]:
+    """Whole digest document. Views that need less should use get_digest_sections / get_digest_stocks_html."""
     conn = _get_conn()
-    try:
-        cur = conn.execute('SELECT data_json FROM digests WHERE date = ?', (date_str,))
-        row = cur.fetchone()
-        if not row:
+    parts = _read_digest_parts(conn, date_str)
+    if not parts:
+        return _legacy_digest(conn, date_str)
+    return _assemble_digest(parts)
+
+
+def get_digest_sections(date_str: str, sections: Optional[List[str]] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    A digest's sections ({name: articles}), decoding only the requested ones.
+    Returns None if there is no digest for the date; missing sections map to [].
+    """
+    conn = _get_conn()
+    if sections is None:
+        meta = _read_digest_parts(conn, date_str, []).get('meta')
+        if meta is not None:
+            sections = meta.get('_section_order', [])
+    wanted = [] if sections is None else [f'section:{name}' for name in sections]
+    parts = _read_digest_parts(conn, date_str, wanted)
+    if not parts:
+        legacy = _legacy_digest(conn, date_str)
+        if legacy is None:
             return None
-        return json.loads(row[0])
-    finally:
-        conn.close()
+        all_sections = legacy.get('sections') or {}
+        return dict(all_sections) if sections is None else {name: all_sections.get(name, []) for name in sections}
+    return {name: parts.get(f'section:{name}', []) for name in sections or []}
+
+
+def get_digest_stocks_html(date_str: str) -> Optional[str]:
+    """A digest's stocks HTML ('' if it has none), or None if there is no digest for the date."""
+    conn = _get_conn()
+    parts = _read_digest_parts(conn, date_str, ['stocks_html'])
+    if not parts:
+        legacy = _legacy_digest(conn, date_str)
+        return None if legacy is None else (legacy.get('stocks_html') or '')
+    return parts.get('stocks_html') or ''
+
+
+def get_digest_version(date_str: str) -> Optional[str]:
+    """created_at of a date's digest, or None if there is none; cheap, never loads data_json."""
+    conn = _get_conn()
+    row = conn.execute('SELECT created_at FROM digests WHERE date = ?', (date_str,)).fetchone()
+    return row[0] if row else None
 
 
 def list_digest_dates_between(start_date: str, end_date: str) -> Set[str]:
     conn = _get_conn()
-    try:
-        cur = conn.execute('SELECT date FROM digests WHERE date BETWEEN ? AND ?', (start_date, end_date))
-        return {r[0] for r in cur.fetchall()}
-    finally:
-        conn.close()
+    cur = conn.execute('SELECT date FROM digests WHERE date BETWEEN ? AND ?', (start_date, end_date))
+    return {r[0] for r in cur.fetchall()}
+
+
+def latest_stocks_date(start_date: str, end_date: str) -> Optional[str]:
+    """Most recent digest date in [start_date, end_date] that has a stocks report."""
+    conn = _get_conn()
+    row = conn.execute(
+        'SELECT date FROM digests WHERE has_stocks = 1 AND date BETWEEN ? AND ? ORDER BY date DESC LIMIT 1',
+        (start_date, end_date)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _fts_query(text: str) -> str:
+    # Quote each term so user input can't inject FTS5 syntax; terms are ANDed and prefix-matched
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in text.split())
+
+
+def search_articles(query: str, section: str = '', start_date: str = '', end_date: str = '', limit: int = 50) -> List[Dict[str, Any]]:
+    """Full-text search over digest history, best match first (newest first without FTS5)."""
+    if not query.strip():
+        return []
+    filters, params = [], []
+    if section:
+        filters.append('a.section = ?')
+        params.append(section)
+    if start_date:
+        filters.append('a.digest_date >= ?')
+        params.append(start_date)
+    if end_date:
+        filters.append('a.digest_date <= ?')
+        params.append(end_date)
+
+    cols = 'a.digest_date, a.section, a.client, a.source, a.url, a.title, a.summary, a.published_date, a.verified'
+    conn = _get_conn()
+    if _fts_enabled:
+        where = ' AND '.join(['articles_fts MATCH ?'] + filters)
+        cur = conn.execute(
+            f'SELECT {cols} FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid '
+            f'WHERE {where} ORDER BY bm25(articles_fts), a.digest_date DESC LIMIT ?',
+            [_fts_query(query)] + params + [limit]
+        )
+    else:
+        terms = query.split()
+        likes = ["(a.title LIKE ? OR a.summary LIKE ? OR a.source LIKE ?)"] * len(terms)
+        like_params = [p for t in terms for p in (f'%{t}%',) * 3]
+        where = ' AND '.join(likes + filters)
+        cur = conn.execute(
+            f'SELECT {cols} FROM articles a WHERE {where} ORDER BY a.digest_date DESC, a.position LIMIT ?',
+            like_params + params + [limit]
+        )
+    out = []
+    for digest_date, sec, client, source, url, title, summary, published_date, verified in cur.fetchall():
+        out.append({
+            'digest_date': digest_date, 'section': sec, 'client': client or '', 'source': source or '', 'url': url or '',
+            'title': title, 'summary': summary or '', 'published_date': published_date or '',
+            'verified': None if verified is None else bool(verified),
+        })
+    return out
 
 
 def list_saved_articles() -> List[Dict[str, Any]]:
     conn = _get_conn()
-    try:
-        cur = conn.execute('SELECT id, title, url, section, summary, saved_at, published_date FROM saved_articles ORDER BY COALESCE(published_date, saved_at) DESC, saved_at DESC')
-        out = []
-        for id_, title, url, section, summary, saved_at, published_date in cur.fetchall():
-            out.append({
-                'id': id_, 'title': title, 'url': url, 'section': section or '', 'summary': summary or '', 'saved_at': saved_at, 'published_date': published_date or ''
-            })
-        return out
-    finally:
-        conn.close()
+    cur = conn.execute('SELECT id, title, url, section, summary, saved_at, published_date FROM saved_articles ORDER BY COALESCE(published_date, saved_at) DESC, saved_at DESC')
+    out = []
+    for id_, title, url, section, summary, saved_at, published_date in cur.fetchall():
+        out.append({
+            'id': id_, 'title': title, 'url': url, 'section': section or '', 'summary': summary or '', 'saved_at': saved_at, 'published_date': published_date or ''
+        })
+    return out
 
 
 def is_article_saved(url: str) -> bool:
     conn = _get_conn()
-    try:
-        cur = conn.execute('SELECT 1 FROM saved_articles WHERE url = ? LIMIT 1', (url,))
-        return cur.fetchone() is not None
-    finally:
-        conn.close()
+    cur = conn.execute('SELECT 1 FROM saved_articles WHERE url_key = ? LIMIT 1', (url_key(url),))
+    return cur.fetchone() is not None
 
 
-def save_article(title: str, url: str, section: str = '', summary: str = '', published_date: str = '') -> None:
+def saved_urls_among(urls: List[str]) -> Set[str]:
+    """
+    Subset of urls that are saved under any variant of the same canonical URL,
+    resolved with one indexed IN query per 250 keys.
+    """
+    by_key: Dict[str, List[str]] = {}
+    for u in urls:
+        if u:
+            by_key.setdefault(url_key(u), []).append(u)
+    keys = list(by_key)
+    found: Set[str] = set()
     conn = _get_conn()
-    try:
+    # Stay well under SQLite's bound-parameter limit
+    for i in range(0, len(keys), 250):
+        chunk = keys[i:i + 250]
+        cur = conn.execute(f'SELECT url_key FROM saved_articles WHERE url_key IN ({",".join("?" * len(chunk))})', chunk)
+        for (key,) in cur.fetchall():
+            found.update(by_key[key])
+    return found
+
+
+def save_article(title: str, url: str, section: str = '', summary: str = '', published_date: str = '') -> None:
+    with transaction() as conn:
         conn.execute(
-            'INSERT OR IGNORE INTO saved_articles (title, url, section, summary, saved_at, published_date) VALUES (?, ?, ?, ?, ?, ?)',
-            (title, url, section, summary, datetime.utcnow().isoformat(), published_date)
+            'INSERT OR IGNORE INTO saved_articles (title, url, section, summary, saved_at, published_date, url_key) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (title, url, section, summary, datetime.utcnow().isoformat(), published_date, url_key(url))
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def delete_article_by_url(url: str) -> None:
+    with transaction() as conn:
+        conn.execute('DELETE FROM saved_articles WHERE url_key = ?', (url_key(url),))
+
+
+def _checkpoint_default(obj: Any) -> Any:
+    # numpy scalars (np.int64, np.bool_, ...) from the stock metrics become their
+    # Python value; anything else would not come back from --resume as it went in
+    if type(obj).__module__ == 'numpy' and callable(getattr(obj, 'item', None)):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def save_checkpoint(run_date: str, stage: str, item: str, data: Any) -> None:
+    """Raises TypeError if data holds values other than JSON types and numpy scalars."""
+    data_json = json.dumps(data, default=_checkpoint_default)
+    with transaction() as conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO pipeline_checkpoints (run_date, stage, item, data_json, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (run_date, stage, item, data_json, datetime.utcnow().isoformat())
+        )
+
+
+def get_checkpoints(run_date: str, stage: str) -> Dict[str, Any]:
     conn = _get_conn()
-    try:
-        conn.execute('DELETE FROM saved_articles WHERE url = ?', (url,))
-        conn.commit()
-    finally:
-        conn.close() 
\ No newline at end of file
+    cur = conn.execute('SELECT item, data_json FROM pipeline_checkpoints WHERE run_date = ? AND stage = ?', (run_date, stage))
+    return {item: json.loads(data_json) for item, data_json in cur.fetchall()}
+
+
+def clear_checkpoints(run_date: str) -> None:
+    with transaction() as conn:
+        conn.execute('DELETE FROM pipeline_checkpoints WHERE run_date = ?', (run_date,))
+
+
+def prune_checkpoints(before_date: str) -> int:
+    with transaction() as conn:
+        cur = conn.execute('DELETE FROM pipeline_checkpoints WHERE run_date < ?', (before_date,))
+        return cur.rowcount
+
+
+# Fields verify_article_with_search sets; stored so a later run can reuse the outcome
+_VERIFICATION_FIELDS = ('verified_url', 'verified_date', 'date_verification', 'verification_reason', 'original_url')
+
+
+def _story_keys(article: Dict[str, Any]) -> Tuple[str, str]:
+    url = article.get('original_url') or article.get('url') or ''
+    return normalize_text(article.get('title', '')), url_key(url)
+
+
+def story_key(article: Dict[str, Any]) -> str:
+    """Key seen_stories_among uses for an article (its normalized title)."""
+    return _story_keys(article)[0]
+
+
+def _mark_published(conn: sqlite3.Connection, date_str: str, data: Dict[str, Any]) -> None:
+    rows = []
+    for items in (data.get('sections') or {}).values():
+        for a in items or []:
+            if not isinstance(a, dict):
+                continue
+            title_key, story_url_key = _story_keys(a)
+            if title_key:
+                rows.append((title_key, story_url_key, date_str, date_str, date_str))
+    # Keep the earliest publication date when an older digest is re-saved
+    conn.executemany(
+        'INSERT INTO seen_stories (title_key, url_key, first_seen, last_seen, published_on) VALUES (?, ?, ?, ?, ?) '
+        'ON CONFLICT(title_key) DO UPDATE SET '
+        'first_seen = MIN(first_seen, excluded.first_seen), last_seen = MAX(last_seen, excluded.last_seen), '
+        'published_on = COALESCE(MIN(published_on, excluded.published_on), excluded.published_on)',
+        rows
+    )
+
+
+def _backfill_seen_stories(conn: sqlite3.Connection) -> None:
+    """Seed the seen-story index from already published digests."""
+    if conn.execute('SELECT 1 FROM seen_stories LIMIT 1').fetchone():
+        return
+    rows = conn.execute('SELECT digest_date, section, title, url FROM articles ORDER BY digest_date').fetchall()
+    by_date: Dict[str, Dict[str, Any]] = {}
+    for date_str, section, title, url in rows:
+        by_date.setdefault(date_str, {'sections': {}})['sections'].setdefault(section, []).append({'title': title, 'url': url})
+    if by_date:
+        with transaction():
+            for date_str, data in by_date.items():
+                _mark_published(conn, date_str, data)
+
+
+def seen_stories_among(articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index entries for articles seen by earlier runs, keyed by the article's title key.
+    An article matches on its normalized title or, failing that, its canonical URL;
+    entry['url_key'] lets callers tell the two apart before trusting the entry.
+    """
+    keys = [_story_keys(a) for a in articles]
+    title_keys = list({t for t, _ in keys if t})
+    url_keys = list({u for _, u in keys if u})
+    rows: Dict[str, Dict[str, Any]] = {}
+    by_url: Dict[str, Dict[str, Any]] = {}
+    conn = _get_conn()
+    for column, values in (('title_key', title_keys), ('url_key', url_keys)):
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cur = conn.execute(
+                'SELECT title_key, url_key, first_seen, last_seen, verified, verified_on, verification_json, published_on '
+                f'FROM seen_stories WHERE {column} IN ({placeholders})',
+                chunk
+            )
+            for title_key, row_url_key, first_seen, last_seen, verified, verified_on, verification_json, published_on in cur.fetchall():
+                entry = {
+                    'title_key': title_key, 'url_key': row_url_key, 'first_seen': first_seen, 'last_seen': last_seen,
+                    'verified': None if verified is None else bool(verified), 'verified_on': verified_on,
+                    'verification': json.loads(verification_json) if verification_json else {},
+                    'published_on': published_on,
+                }
+                rows[title_key] = entry
+                if row_url_key:
+                    by_url[row_url_key] = entry
+    out: Dict[str, Dict[str, Any]] = {}
+    for title_key, story_url_key in keys:
+        entry = rows.get(title_key) or by_url.get(story_url_key)
+        if title_key and entry:
+            out[title_key] = entry
+    return out
+
+
+def touch_seen_stories(run_date: str, title_keys: List[str]) -> None:
+    """Move last_seen up to run_date for stories fetched again, so retention counts days unseen."""
+    rows = [(run_date, k) for k in set(title_keys) if k]
+    if rows:
+        with transaction() as conn:
+            conn.executemany('UPDATE seen_stories SET last_seen = MAX(last_seen, ?) WHERE title_key = ?', rows)
+
+
+def record_story_verifications(run_date: str, articles: List[Dict[str, Any]]) -> None:
+    """Store each article's verification outcome (its 'verified' flag plus the search fields)."""
+    rows = []
+    for a in articles:
+        title_key, story_url_key = _story_keys(a)
+        if not title_key or a.get('verified') is None:
+            continue
+        outcome = {k: a[k] for k in _VERIFICATION_FIELDS if a.get(k)}
+        rows.append((title_key, story_url_key, run_date, run_date, int(bool(a['verified'])), run_date, json.dumps(outcome)))
+    if not rows:
+        return
+    with transaction() as conn:
+        conn.executemany(
+            'INSERT INTO seen_stories (title_key, url_key, first_seen, last_seen, verified, verified_on, verification_json) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(title_key) DO UPDATE SET '
+            'url_key = COALESCE(NULLIF(excluded.url_key, \'\'), url_key), '
+            'first_seen = MIN(first_seen, excluded.first_seen), last_seen = MAX(last_seen, excluded.last_seen), '
+            'verified = excluded.verified, verified_on = excluded.verified_on, verification_json = excluded.verification_json',
+            rows
+        )
+
+
+def prune_seen_stories(before_date: str) -> int:
+    """Forget stories not seen since before_date (indexed on last_seen)."""
+    with transaction() as conn:
+        return conn.execute('DELETE FROM seen_stories WHERE last_seen < ?', (before_date,)).rowcount
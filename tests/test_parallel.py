@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+import parallel
+
+
+@pytest.fixture
+def capped(monkeypatch):
+    """A fake provider capped at two concurrent calls."""
+    monkeypatch.setitem(parallel._provider_semaphores, "capped", threading.BoundedSemaphore(2))
+    return "capped"
+
+
+def test_async_waits_for_slots_held_by_sync_callers(capped):
+    async def take_slot():
+        async with parallel.async_provider_slot(capped):
+            return True
+
+    with parallel.provider_slot(capped), parallel.provider_slot(capped):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(take_slot(), 0.2))
+    assert asyncio.run(asyncio.wait_for(take_slot(), 1))
+
+
+def test_sync_waits_for_slots_held_by_async_callers(capped):
+    sem = parallel._provider_semaphores[capped]
+
+    async def hold_both():
+        async with parallel.async_provider_slot(capped), parallel.async_provider_slot(capped):
+            return sem.acquire(timeout=0.2)
+
+    assert asyncio.run(hold_both()) is False
+    assert sem.acquire(timeout=1)
+    sem.release()
+
+
+def test_mixed_callers_never_exceed_cap(capped):
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def enter():
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+
+    def leave():
+        with lock:
+            in_flight[0] -= 1
+
+    def sync_call():
+        with parallel.provider_slot(capped):
+            enter()
+            threading.Event().wait(0.02)
+            leave()
+
+    async def async_call():
+        async with parallel.async_provider_slot(capped):
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+
+    async def main():
+        await asyncio.gather(*(async_call() for _ in range(6)))
+
+    threads = [threading.Thread(target=sync_call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    asyncio.run(main())
+    for t in threads:
+        t.join()
+    assert in_flight == [0, 2]
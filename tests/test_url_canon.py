@@ -0,0 +1,24 @@
+from url_canon import canonicalize, url_key
+
+
+def test_amp_path_kept_on_unlisted_domains():
+    assert canonicalize("https://example.com/news/amp") == "https://example.com/news/amp"
+    assert canonicalize("https://example.com/amp/story") == "https://example.com/amp/story"
+
+
+def test_amp_path_stripped_for_listed_publishers():
+    assert canonicalize("https://www.reuters.com/world/story/amp/") == "https://www.reuters.com/world/story"
+    assert canonicalize("https://www.cnbc.com/amp/2024/06/01/story.html") == "https://www.cnbc.com/2024/06/01/story.html"
+
+
+def test_amp_host_and_param_stripped_everywhere():
+    assert url_key("https://amp.example.com/news?amp=1") == url_key("https://example.com/news")
+
+
+def test_query_escapes_preserved():
+    assert canonicalize("https://example.com/search?q=a%20b&path=x%2Fy") == "https://example.com/search?path=x%2Fy&q=a%20b"
+    assert canonicalize("https://example.com/search?q=a+b") == "https://example.com/search?q=a+b"
+
+
+def test_tracking_params_dropped_and_order_normalized():
+    assert url_key("https://example.com/p?b=2&utm_source=x&a=1") == url_key("https://example.com/p?a=1&b=2")
@@ -0,0 +1,158 @@
+"""
+URL canonicalization shared by ingestion, dedup, caches and saved articles.
+
+canonicalize(url) returns a cleaned URL that still opens the article:
+redirect wrappers (Google /url, Google AMP viewer, AMP cache, Facebook l.php)
+are unwrapped, tracking parameters dropped, AMP and mobile variants mapped to
+the regular page, and the fragment, default port and trailing slash removed.
+Kept query parameters are sorted but otherwise left exactly as encoded.
+url_key(url) goes one step further (no scheme, no www.) and is the identity
+used wherever two URLs must compare equal.
+
+Per-domain behaviour lives in DOMAIN_RULES; everything else is driven by the
+precompiled patterns below. Both functions are memoized.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
+from urllib.parse import parse_qsl, unquote_plus, urlsplit, urlunsplit
+
+# Click/campaign tracking parameters, dropped on every domain
+_TRACKING_PARAM = re.compile(
+    r"^(utm_\w+|fbclid|gclid|dclid|gbraid|wbraid|msclkid|yclid|mc_cid|mc_eid|_ga|_gl|igshid|"
+    r"ocid|cmpid|icid|ito|smid|s_cid|ref_src|sr_share|taid|guccounter|guce_\w+|at_\w+|ns_\w+|"
+    r"wt\.mc_id|rss|fromrss|amp|_amp|amp_js_v|usqp|outputtype)$",
+    re.IGNORECASE,
+)
+# Mobile and AMP host prefixes (m.example.com, mobile.example.com, amp.example.com)
+_MOBILE_HOST = re.compile(r"^(?:m|mobile|amp)\.(?=[^.]+\.[^.])", re.IGNORECASE)
+# AMP path variants: /amp/..., .../amp, .../amp.html (DOMAIN_RULES publishers only),
+# ...article.amp.html (everywhere)
+_AMP_PREFIX = re.compile(r"^/amp(?=/)", re.IGNORECASE)
+_AMP_SUFFIX = re.compile(r"/amp(?:\.html?)?/?$", re.IGNORECASE)
+_AMP_EXT = re.compile(r"\.amp(\.html?)?$", re.IGNORECASE)
+# https://www-example-com.cdn.ampproject.org/c/s/www.example.com/path
+_AMP_CACHE_PATH = re.compile(r"^/[cv]/(s/)?(.+)$")
+# https://www.google.com/amp/s/www.example.com/path
+_GOOGLE_AMP_PATH = re.compile(r"^/amp/(s/)?(.+)$")
+_GOOGLE_HOST = re.compile(r"^(?:www\.)?google\.[a-z.]+$")
+_DEFAULT_PORT = re.compile(r":(?:80|443)$")
+
+# Per-domain overrides, matched on the registrable host or any parent domain.
+# keep: query params allowed through (everything else is dropped); None keeps
+#       all params except tracking ones.
+# Only hosts listed here get /amp path prefixes and suffixes stripped; elsewhere
+# a path ending in /amp may be a real page.
+DOMAIN_RULES: Dict[str, Dict[str, Optional[FrozenSet[str]]]] = {
+    "youtube.com": {"keep": frozenset({"v", "list"})},
+    "reuters.com": {"keep": frozenset()},
+    "bloomberg.com": {"keep": frozenset()},
+    "ft.com": {"keep": frozenset()},
+    "wsj.com": {"keep": frozenset()},
+    "nytimes.com": {"keep": frozenset()},
+    "cnbc.com": {"keep": frozenset()},
+    "forbes.com": {"keep": frozenset()},
+    "linkedin.com": {"keep": frozenset()},
+    "gulfnews.com": {"keep": frozenset()},
+    "khaleejtimes.com": {"keep": frozenset()},
+    "thenationalnews.com": {"keep": frozenset()},
+    "arabianbusiness.com": {"keep": frozenset()},
+    "zawya.com": {"keep": frozenset()},
+    "campaignme.com": {"keep": frozenset()},
+}
+
+_MAX_UNWRAP = 3
+
+
+def _domain_rule(host: str) -> Dict[str, Optional[FrozenSet[str]]]:
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        rule = DOMAIN_RULES.get(".".join(labels[i:]))
+        if rule is not None:
+            return rule
+    return {}
+
+
+def _viewer_target(m: "re.Match[str]", query: str) -> str:
+    # Viewer URLs embed the target's host and path; its query rides on the viewer URL
+    target = ("https://" if m.group(1) else "http://") + m.group(2)
+    return f"{target}?{query}" if query else target
+
+
+def _unwrap(host: str, path: str, query: str) -> Optional[str]:
+    """Target URL when this URL is a known redirect/viewer wrapper."""
+    if _GOOGLE_HOST.match(host):
+        if path == "/url":
+            params = dict(parse_qsl(query))
+            target = params.get("q") or params.get("url")
+            if target and target.startswith(("http://", "https://")):
+                return target
+        m = _GOOGLE_AMP_PATH.match(path)
+        if m:
+            return _viewer_target(m, query)
+    if host.endswith(".cdn.ampproject.org"):
+        m = _AMP_CACHE_PATH.match(path)
+        if m:
+            return _viewer_target(m, query)
+    if host in ("l.facebook.com", "lm.facebook.com") and path == "/l.php":
+        target = dict(parse_qsl(query)).get("u")
+        if target and target.startswith(("http://", "https://")):
+            return target
+    return None
+
+
+def _clean_query(query: str, keep: Optional[FrozenSet[str]]) -> str:
+    # Filter on decoded names but keep each k=v segment as encoded: re-encoding
+    # would turn %20 into + and rewrite other escapes the server may care about
+    segments: List[str] = []
+    for segment in query.split("&"):
+        if not segment:
+            continue
+        name = unquote_plus(segment.split("=", 1)[0])
+        if keep is not None:
+            if name in keep:
+                segments.append(segment)
+        elif not _TRACKING_PARAM.match(name):
+            segments.append(segment)
+    return "&".join(sorted(segments))
+
+
+@lru_cache(maxsize=8192)
+def canonicalize(url: str) -> str:
+    """Cleaned, still-fetchable form of url; non-http(s) input is returned stripped."""
+    url = (url or "").strip()
+    for _ in range(_MAX_UNWRAP + 1):
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.netloc:
+            return url
+        host = _DEFAULT_PORT.sub("", parts.netloc.lower())
+        target = _unwrap(host, parts.path, parts.query)
+        if target is None:
+            break
+        url = target
+
+    host = _MOBILE_HOST.sub("", host)
+    rule = _domain_rule(host)
+    path = parts.path
+    if rule:
+        path = _AMP_PREFIX.sub("", path)
+        path = _AMP_SUFFIX.sub("", path)
+    path = _AMP_EXT.sub(lambda m: m.group(1) or "", path)
+    path = path.rstrip("/")
+    query = _clean_query(parts.query, rule.get("keep"))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+@lru_cache(maxsize=8192)
+def url_key(url: str) -> str:
+    """Identity for comparing URLs: canonical form without scheme or www."""
+    canon = canonicalize(url)
+    if "://" not in canon:
+        return canon
+    rest = canon.split("://", 1)[1]
+    return rest[4:] if rest.startswith("www.") else rest